@@ -1,26 +1,20 @@
 import os
 import logging
-import time
 import pandas as pd
-from selenium import webdriver
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from report_writer import save_with_auto_width
+from check_registry import register_check
+from driver_factory import init_driver
+from page_readiness import open_page, wait_for_page_ready
+from dom_extract import extract_texts_by_selector
+from element_lookup import find_all, wait_until
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
-# Initialize WebDriver
-def init_driver():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.implicitly_wait(10)
-    return driver
-
 # Ensure directory exists
 def ensure_directory(path):
     if not os.path.exists(path):
@@ -29,89 +23,78 @@ def ensure_directory(path):
     else:
         logging.info(f"Directory already exists: {path}")
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df, has_reason_column=False):
-    df.to_excel(filepath, index=False, engine='openpyxl')
-    wb = load_workbook(filepath)
-    ws = wb.active
-
-    # Define styles for formatting
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    # Adjust column widths and format headers
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except Exception as e:
-                logging.warning(f"Error calculating column width: {e}")
-                pass
-            cell.alignment = alignment
-            cell.border = border
-        ws.column_dimensions[col_letter].width = max_length + 5
-
-    # Apply header formatting
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = alignment
-
-    # Format the 'Reason' column to match the layout in the image
-    if has_reason_column:
-        reason_col = ws['D']
-        for cell in reason_col[1:]:  # Skip header
-            if cell.value:
-                cell.value = f"Message:\n{cell.value}"  # Add 'Message:' prefix with a newline
-                cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
-
-    wb.save(filepath)
+# Seconds to wait for the currency dropdown, and for its options after opening it; a missing dropdown costs only this
+DROPDOWN_TIMEOUT = 5
+OPTIONS_TIMEOUT = 2
+
+# Read one attribute of several elements in a single script call; missing attributes become ""
+def option_attributes(driver, elements, attribute):
+    return driver.execute_script("""
+        var attribute = arguments[1];
+        return arguments[0].map(function (el) { return el.getAttribute(attribute) || ""; });
+    """, elements, attribute)
+
+# Check the property tiles and prices of the page currently shown in a currency and return its result row
+def currency_result(driver, country, currency_code, symbol):
+    # Tile and price texts in one round trip
+    texts = extract_texts_by_selector(driver, [".property-tiles", ".js-price-value"])
+    tile_texts = texts[".property-tiles"]
+    price_texts = texts[".js-price-value"]
+
+    if not tile_texts or not price_texts:
+        return {"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Inconclusive", "Reason": "No property tiles or price info found to verify currency change"}
+
+    logging.info(f"Currency: {symbol}")
+    logging.info(f"Property Tiles Text: {tile_texts}")
+    logging.info(f"Price Info Text: {price_texts}")
+
+    expected_symbol = symbol.split()[0]
+    symbol_match_tiles = any(expected_symbol in text for text in tile_texts)
+    symbol_match_prices = any(expected_symbol in text for text in price_texts)
+
+    if symbol_match_tiles and symbol_match_prices:
+        return {"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Pass"}
+    return {"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Fail"}
 
 # Test currency filter functionality
-def test_currency_filter(driver, url, currency_list):
+def test_currency_filter(driver, url, currency_list, load_page=True):
     logging.info(f"Starting Currency Filter Test for URL: {url}")
     results = []  # List to store individual test results for each currency
 
     try:
-        driver.get(url)
-        logging.info("Page loaded successfully.")
+        if load_page:
+            open_page(driver, url, timeout=20)
+            logging.info("Page loaded successfully.")
 
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-        # Scroll down to load all content
+        # Scroll down to load all content, then wait for the lazily loaded content to settle
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        wait_for_page_ready(driver)
 
-        dropdown = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, ".select-wrap"))
-        )
+        dropdown = wait_until(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, ".select-wrap")),
+                              timeout=DROPDOWN_TIMEOUT, description=".select-wrap")
+        if not dropdown:
+            logging.warning("Currency dropdown not found on the page.")
+            return []
         driver.execute_script("arguments[0].click();", dropdown)
 
-        options = dropdown.find_elements(By.CSS_SELECTOR, ".select-ul > li")
+        options = find_all(dropdown, By.CSS_SELECTOR, ".select-ul > li", timeout=OPTIONS_TIMEOUT)
         logging.info(f"Found {len(options)} currency options.")
 
         if not options:
             logging.warning("No currency options found in the dropdown.")
             return []
 
+        # Read every option's country in one round trip
+        option_countries = option_attributes(driver, options, "data-currency-country")
+
         for currency_code, currency_data in currency_list.items():
             country = currency_data["Country"]
             symbol = currency_data["Symbol"]
             logging.info(f"Testing currency: {country} ({currency_code})")
 
             matching_option = None
-            for option in options:
-                if currency_code in option.get_attribute("data-currency-country"):
+            for option, option_country in zip(options, option_countries):
+                if currency_code in option_country:
                     matching_option = option
                     break
 
@@ -121,32 +104,11 @@ def test_currency_filter(driver, url, currency_list):
 
             try:
                 driver.execute_script("arguments[0].click();", matching_option)
-                WebDriverWait(driver, 10).until(
-                    EC.text_to_be_present_in_element((By.ID, "js-currency-sort-footer"), symbol)
-                )
-
-                tiles = driver.find_elements(By.CLASS_NAME, "property-tiles")
-                price_info = driver.find_elements(By.CLASS_NAME, "js-price-value")
-
-                if not tiles or not price_info:
-                    results.append({"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Inconclusive", "Reason": "No property tiles or price info found to verify currency change"})
-                    continue
+                if not wait_until(driver, EC.text_to_be_present_in_element((By.ID, "js-currency-sort-footer"), symbol),
+                                  timeout=10, description="#js-currency-sort-footer"):
+                    raise TimeoutException(f"Currency symbol {symbol} did not appear in the footer.")
 
-                tile_texts = [tile.text for tile in tiles]
-                price_texts = [price.text for price in price_info]
-
-                logging.info(f"Currency: {symbol}")
-                logging.info(f"Property Tiles Text: {tile_texts}")
-                logging.info(f"Price Info Text: {price_texts}")
-
-                expected_symbol = symbol.split()[0]
-                symbol_match_tiles = any(expected_symbol in text for text in tile_texts)
-                symbol_match_prices = any(expected_symbol in text for text in price_texts)
-
-                if symbol_match_tiles and symbol_match_prices:
-                    results.append({"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Pass"})
-                else:
-                    results.append({"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Fail"})
+                results.append(currency_result(driver, country, currency_code, symbol))
 
             except Exception as e:
                 results.append({"Country Name": country, "Currency Name": currency_code, "Symbol": symbol, "Status": "Fail", "Reason": f"Error selecting currency {symbol}: {e}"})
@@ -158,53 +120,174 @@ def test_currency_filter(driver, url, currency_list):
         logging.error(f"Error during Currency Filter Test: {str(e)}")
         return []
 
+# Currencies tested by default, keyed by the dropdown option's data-currency-country
+CURRENCY_LIST = {
+    "AE": {"Code": "AED", "Country": "AE", "Symbol": "\u062f.\u0625."},
+    "AU": {"Code": "AUD", "Country": "AU", "Symbol": "$"},
+    "BD": {"Code": "BDT", "Country": "BD", "Symbol": "\u09f3"},
+    "BE": {"Code": "EUR", "Country": "BE", "Symbol": "\u20ac"},
+    "CA": {"Code": "CAD", "Country": "CA", "Symbol": "$"},
+    "US": {"Code": "USD", "Country": "US", "Symbol": "$"},
+}
+
+# Wider list tested when currencies are spread over several browser contexts. It has not been checked
+# against the live dropdown: countries and symbols are each currency's usual ones, and a country the
+# dropdown does not offer is skipped with a warning
+EXTENDED_CURRENCY_LIST = {
+    "AE": {"Code": "AED", "Country": "AE", "Symbol": "\u062f.\u0625."},
+    "AR": {"Code": "ARS", "Country": "AR", "Symbol": "$"},
+    "AU": {"Code": "AUD", "Country": "AU", "Symbol": "$"},
+    "BD": {"Code": "BDT", "Country": "BD", "Symbol": "\u09f3"},
+    "BE": {"Code": "EUR", "Country": "BE", "Symbol": "\u20ac"},
+    "BR": {"Code": "BRL", "Country": "BR", "Symbol": "R$"},
+    "CA": {"Code": "CAD", "Country": "CA", "Symbol": "$"},
+    "CH": {"Code": "CHF", "Country": "CH", "Symbol": "CHF"},
+    "CL": {"Code": "CLP", "Country": "CL", "Symbol": "$"},
+    "CN": {"Code": "CNY", "Country": "CN", "Symbol": "\u00a5"},
+    "CO": {"Code": "COP", "Country": "CO", "Symbol": "$"},
+    "CZ": {"Code": "CZK", "Country": "CZ", "Symbol": "K\u010d"},
+    "DK": {"Code": "DKK", "Country": "DK", "Symbol": "kr"},
+    "EG": {"Code": "EGP", "Country": "EG", "Symbol": "E\u00a3"},
+    "GB": {"Code": "GBP", "Country": "GB", "Symbol": "\u00a3"},
+    "HK": {"Code": "HKD", "Country": "HK", "Symbol": "HK$"},
+    "HU": {"Code": "HUF", "Country": "HU", "Symbol": "Ft"},
+    "ID": {"Code": "IDR", "Country": "ID", "Symbol": "Rp"},
+    "IL": {"Code": "ILS", "Country": "IL", "Symbol": "\u20aa"},
+    "IN": {"Code": "INR", "Country": "IN", "Symbol": "\u20b9"},
+    "JP": {"Code": "JPY", "Country": "JP", "Symbol": "\u00a5"},
+    "KR": {"Code": "KRW", "Country": "KR", "Symbol": "\u20a9"},
+    "KW": {"Code": "KWD", "Country": "KW", "Symbol": "\u062f.\u0643."},
+    "MA": {"Code": "MAD", "Country": "MA", "Symbol": "\u062f.\u0645."},
+    "MX": {"Code": "MXN", "Country": "MX", "Symbol": "$"},
+    "MY": {"Code": "MYR", "Country": "MY", "Symbol": "RM"},
+    "NG": {"Code": "NGN", "Country": "NG", "Symbol": "\u20a6"},
+    "NO": {"Code": "NOK", "Country": "NO", "Symbol": "kr"},
+    "NZ": {"Code": "NZD", "Country": "NZ", "Symbol": "$"},
+    "PE": {"Code": "PEN", "Country": "PE", "Symbol": "S/"},
+    "PH": {"Code": "PHP", "Country": "PH", "Symbol": "\u20b1"},
+    "PK": {"Code": "PKR", "Country": "PK", "Symbol": "\u20a8"},
+    "PL": {"Code": "PLN", "Country": "PL", "Symbol": "z\u0142"},
+    "QA": {"Code": "QAR", "Country": "QA", "Symbol": "\u0631.\u0642."},
+    "RO": {"Code": "RON", "Country": "RO", "Symbol": "lei"},
+    "SA": {"Code": "SAR", "Country": "SA", "Symbol": "\u0631.\u0633."},
+    "SE": {"Code": "SEK", "Country": "SE", "Symbol": "kr"},
+    "SG": {"Code": "SGD", "Country": "SG", "Symbol": "$"},
+    "TH": {"Code": "THB", "Country": "TH", "Symbol": "\u0e3f"},
+    "TR": {"Code": "TRY", "Country": "TR", "Symbol": "\u20ba"},
+    "TW": {"Code": "TWD", "Country": "TW", "Symbol": "NT$"},
+    "UA": {"Code": "UAH", "Country": "UA", "Symbol": "\u20b4"},
+    "US": {"Code": "USD", "Country": "US", "Symbol": "$"},
+    "VN": {"Code": "VND", "Country": "VN", "Symbol": "\u20ab"},
+    "ZA": {"Code": "ZAR", "Country": "ZA", "Symbol": "R"},
+}
+
+# Number of browser contexts checking currencies at the same time
+CURRENCY_WORKERS = 3
+
+# Test currencies in several browser contexts at once, each with its own share of the currency list
+def test_currency_filter_parallel(url, currency_list, workers=CURRENCY_WORKERS, driver=None, load_page=True):
+    """
+    Run the currency filter test concurrently in separate browser contexts.
+
+    Args:
+        url (str): URL of the page to test.
+        currency_list (dict): Currencies to test, keyed by currency code.
+        workers (int): Number of browser contexts.
+        driver (webdriver): Optional existing driver used as the first context.
+        load_page (bool): Reload the page in the existing driver; new contexts always load it.
+
+    Returns:
+        list: Result rows in the order of `currency_list`, as returned by test_currency_filter.
+    """
+    codes = list(currency_list)
+    groups = [group for group in (codes[index::workers] for index in range(max(1, workers))) if group]
+
+    def run_group(index, group):
+        own_driver = driver is None or index > 0
+        if own_driver:
+            group_driver = init_driver()
+        else:
+            group_driver = driver
+        try:
+            group_currencies = {code: currency_list[code] for code in group}
+            return test_currency_filter(group_driver, url, group_currencies, load_page=load_page or own_driver)
+        finally:
+            if own_driver:
+                group_driver.quit()
+
+    logging.info(f"Testing {len(codes)} currencies in {len(groups)} browser contexts.")
+    with ThreadPoolExecutor(max_workers=max(1, len(groups))) as executor:
+        group_results = list(executor.map(run_group, range(len(groups)), groups))
+
+    # Merge the rows back into the order of the currency list
+    rows_by_code = {row["Currency Name"]: row for results in group_results for row in results}
+    return [rows_by_code[code] for code in codes if code in rows_by_code]
+
+# Build the currency results and summary DataFrames; results is None when no currency was tested
+def build_currency_frames(url, results):
+    df_results = pd.DataFrame(results) if results else None
+
+    pass_count = len([res for res in results if res["Status"] == "Pass"])
+    fail_count = len([res for res in results if res["Status"] == "Fail"])
+
+    overall_status = "Pass" if fail_count == 0 else "Fail"
+    comments = "All currencies passed successfully." if fail_count == 0 else f"{fail_count} currencies failed."
+
+    summary_data = [{
+        "Page URL": url,
+        "Test Case": "Currency Filter Test",
+        "Status": overall_status,
+        "Comments": comments
+    }]
+    df_summary = pd.DataFrame(summary_data)
+    return df_results, df_summary
+
+# Registered check: currency filter on the already loaded page; selecting currencies changes page state
+@register_check("Currency_Filtering_Test", inputs=("driver", "url", "currency_workers"),
+                results_file="currency_test_results.xlsx", summary_file="currency_test_summary.xlsx",
+                has_reason_column=True, mutates_page=True)
+def collect_currency_frames(driver, url, currency_workers):
+    return build_currency_frames(url, check_currencies(driver, url, load_page=False, workers=currency_workers or 1))
+
+# Currencies tested when none are given: the wider list only when several contexts share the work
+def default_currency_list(workers):
+    return EXTENDED_CURRENCY_LIST if workers > 1 else CURRENCY_LIST
+
+# Test currencies with the given driver, spreading them over extra browser contexts when workers > 1
+def check_currencies(driver, url, currency_list=None, load_page=True, workers=1):
+    if currency_list is None:
+        currency_list = default_currency_list(workers)
+    if workers > 1:
+        return test_currency_filter_parallel(url, currency_list, workers=workers, driver=driver, load_page=load_page)
+    return test_currency_filter(driver, url, currency_list, load_page=load_page)
+
+# Run the currency filter test and save its results and summary
+def run_currency_test(driver, url, output_dir, currency_list=None, load_page=True, workers=1):
+    output_results_xlsx = os.path.join(output_dir, "currency_test_results.xlsx")
+    output_summary_xlsx = os.path.join(output_dir, "currency_test_summary.xlsx")
+
+    results = check_currencies(driver, url, currency_list, load_page=load_page, workers=workers)
+    df_results, df_summary = build_currency_frames(url, results)
+
+    if df_results is not None:
+        logging.info(f"Results retrieved: {len(results)} entries.")
+        save_with_auto_width(output_results_xlsx, df_results, has_reason_column=True)
+        logging.info(f"Test results saved to: {output_results_xlsx}")
+    else:
+        logging.warning("No results to save. Skipping file creation.")
+
+    save_with_auto_width(output_summary_xlsx, df_summary)
+    logging.info(f"Test summary saved to: {output_summary_xlsx}")
+
 # Main function
 def main():
     url = "https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/"  # Replace with the actual URL
     output_dir = "test_results"
     ensure_directory(output_dir)
 
-    output_results_xlsx = os.path.join(output_dir, "currency_test_results.xlsx")
-    output_summary_xlsx = os.path.join(output_dir, "currency_test_summary.xlsx")
-
-    currency_list = {
-        "AE": {"Code": "AED", "Country": "AE", "Symbol": "\u062f.\u0625."},
-        "AU": {"Code": "AUD", "Country": "AU", "Symbol": "$"},
-        "BD": {"Code": "BDT", "Country": "BD", "Symbol": "\u09f3"},
-        "BE": {"Code": "EUR", "Country": "BE", "Symbol": "\u20ac"},
-        "CA": {"Code": "CAD", "Country": "CA", "Symbol": "$"},
-        "US": {"Code": "USD", "Country": "US", "Symbol": "$"},
-    }
-
     driver = init_driver()
     try:
-        results = test_currency_filter(driver, url, currency_list)
-
-        if results:
-            logging.info(f"Results retrieved: {len(results)} entries.")
-            df_results = pd.DataFrame(results)
-            save_with_auto_width(output_results_xlsx, df_results, has_reason_column=True)
-            logging.info(f"Test results saved to: {output_results_xlsx}")
-        else:
-            logging.warning("No results to save. Skipping file creation.")
-
-        pass_count = len([res for res in results if res["Status"] == "Pass"])
-        fail_count = len([res for res in results if res["Status"] == "Fail"])
-
-        overall_status = "Pass" if fail_count == 0 else "Fail"
-        comments = "All currencies passed successfully." if fail_count == 0 else f"{fail_count} currencies failed."
-
-        summary_data = [{
-            "Page URL": url,
-            "Test Case": "Currency Filter Test",
-            "Status": overall_status,
-            "Comments": comments
-        }]
-        df_summary = pd.DataFrame(summary_data)
-
-        save_with_auto_width(output_summary_xlsx, df_summary)
-        logging.info(f"Test summary saved to: {output_summary_xlsx}")
-
+        run_currency_test(driver, url, output_dir, workers=CURRENCY_WORKERS)
     except Exception as e:
         logging.error(f"An error occurred during execution: {e}")
     finally:
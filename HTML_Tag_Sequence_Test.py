@@ -1,87 +1,37 @@
 import os
-import time
 import logging
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from report_writer import save_with_auto_width
+from check_registry import register_check
+from driver_factory import init_driver
+from page_readiness import open_page
+from load_profile import LIGHT_PROFILE
+from dom_extract import extract_headers
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
-# Initialize WebDriver
-def init_driver():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.implicitly_wait(10)  # Wait for elements before raising exceptions
-    return driver
-
 # Ensure directory exists
 def ensure_directory(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df):
-    """
-    Save a DataFrame to an Excel file, auto-adjust column widths, and enhance formatting.
-
-    Args:
-        filepath (str): Path to save the Excel file.
-        df (pd.DataFrame): DataFrame to save.
-    """
-    df.to_excel(filepath, index=False, engine='openpyxl')
-    wb = load_workbook(filepath)
-    ws = wb.active
-
-    # Define styles for formatting
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    # Adjust column widths and format headers
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:  # Avoid issues with None values
-                    max_length = max(max_length, len(str(cell.value)))
-            except Exception as e:
-                logging.warning(f"Error calculating column width: {e}")
-                pass
-            cell.alignment = alignment
-            cell.border = border
-        ws.column_dimensions[col_letter].width = max_length + 5  # Add padding for visibility
-
-    # Apply header formatting
-    for cell in ws[1]:  # First row is the header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = alignment
-
-    wb.save(filepath)
-
 # Test: Check HTML Tag Sequence
-def check_html_sequence(driver, url):
+def check_html_sequence(driver, url, load_page=True):
     logging.info(f"Starting HTML Tag Sequence Test for URL: {url}")
-    driver.get(url)
-    time.sleep(2)
+    if load_page:
+        open_page(driver, url, profile=LIGHT_PROFILE)
 
     # Find all header tags (h1 to h6)
-    headers = driver.find_elements(By.XPATH, "//h1 | //h2 | //h3 | //h4 | //h5 | //h6")
-    
+    headers = extract_headers(driver)
+
+    return evaluate_html_sequence(headers)
+
+# Evaluate a list of (tag name, text) header pairs in document order
+def evaluate_html_sequence(headers):
     # Collecting header tags with their associated text
-    header_info = [{"Tag": header.tag_name.upper(), "Text": header.text} for header in headers]
-    levels = [int(header.tag_name[1]) for header in headers]  # Extract numeric levels
+    header_info = [{"Tag": tag_name.upper(), "Text": text} for tag_name, text in headers]
+    levels = [int(tag_name[1]) for tag_name, _ in headers]  # Extract numeric levels
 
     # Log the header information
     for header in header_info:
@@ -96,6 +46,53 @@ def check_html_sequence(driver, url):
     # If sequence is broken, return Fail and show the sequence
     return "Fail", f"HTML tag sequence is broken. Found sequence: {levels}", header_info, levels
 
+# Build the HTML tag sequence results and summary DataFrames
+def build_html_sequence_frames(url, result, comment, header_info, levels):
+    # Summary for html_tag_summary.xlsx
+    overall_status = "Pass" if result == "Pass" else "Fail"
+    summary_comment = "HTML tag sequence is valid." if result == "Pass" else comment
+    summary_data = [{
+        "Page URL": url,
+        "Test Case": "Test of HTML Tag Sequence",
+        "Status": overall_status,
+        "Comments": summary_comment
+    }]
+    df_summary = pd.DataFrame(summary_data)
+
+    # Detailed HTML tag results for html_tag_results.xlsx (unchanged behavior)
+    header_data = [{"Tag": header["Tag"], "Text": header["Text"]} for header in header_info]
+    if result == "Fail":
+        correct_sequence = sorted(levels)
+        header_data.append({"Tag": "Correct Sequence", "Text": str(correct_sequence)})
+
+    df_header_info = pd.DataFrame(header_data)
+    return df_header_info, df_summary
+
+# Save the HTML tag sequence summary and results files
+def save_html_sequence_results(url, result, comment, header_info, levels, output_dir):
+    output_xlsx_summary = os.path.join(output_dir, "html_tag_summary.xlsx")
+    output_xlsx_results = os.path.join(output_dir, "html_tag_results.xlsx")
+
+    df_header_info, df_summary = build_html_sequence_frames(url, result, comment, header_info, levels)
+    save_with_auto_width(output_xlsx_summary, df_summary)
+    logging.info(f"Summary saved to {output_xlsx_summary}")
+
+    save_with_auto_width(output_xlsx_results, df_header_info)
+    logging.info(f"Header tag information saved to {output_xlsx_results}")
+
+# Registered check: header sequence of the already loaded page
+@register_check("HTML_Tag_Sequence_Test", inputs=("driver", "url"),
+                results_file="html_tag_results.xlsx", summary_file="html_tag_summary.xlsx",
+                load_profile=LIGHT_PROFILE)
+def collect_html_sequence_frames(driver, url):
+    return build_html_sequence_frames(url, *check_html_sequence(driver, url, load_page=False))
+
+# Run the HTML tag sequence test and save its summary and results
+def run_html_sequence_test(driver, url, output_dir, load_page=True):
+    # Run HTML sequence check and get headers info and sequence
+    result, comment, header_info, levels = check_html_sequence(driver, url, load_page=load_page)
+    save_html_sequence_results(url, result, comment, header_info, levels, output_dir)
+
 # Main function
 def main():
     url = "https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/"
@@ -103,38 +100,11 @@ def main():
     # Output file paths
     output_dir = "test_results"
     ensure_directory(output_dir)
-    output_xlsx_summary = os.path.join(output_dir, "html_tag_summary.xlsx")
-    output_xlsx_results = os.path.join(output_dir, "html_tag_results.xlsx")
     
     driver = init_driver()
 
     try:
-        # Run HTML sequence check and get headers info and sequence
-        result, comment, header_info, levels = check_html_sequence(driver, url)
-
-        # Update html_tag_summary.xlsx
-        overall_status = "Pass" if result == "Pass" else "Fail"
-        summary_comment = "HTML tag sequence is valid." if result == "Pass" else comment
-        summary_data = [{
-            "Page URL": url,
-            "Test Case": "Test of HTML Tag Sequence",
-            "Status": overall_status,
-            "Comments": summary_comment
-        }]
-        df_summary = pd.DataFrame(summary_data)
-        save_with_auto_width(output_xlsx_summary, df_summary)
-        logging.info(f"Summary saved to {output_xlsx_summary}")
-
-        # Save detailed HTML tag results to html_tag_results.xlsx (unchanged behavior)
-        header_data = [{"Tag": header["Tag"], "Text": header["Text"]} for header in header_info]
-        if result == "Fail":
-            correct_sequence = sorted(levels)
-            header_data.append({"Tag": "Correct Sequence", "Text": str(correct_sequence)})
-        
-        df_header_info = pd.DataFrame(header_data)
-        save_with_auto_width(output_xlsx_results, df_header_info)
-        logging.info(f"Header tag information saved to {output_xlsx_results}")
-
+        run_html_sequence_test(driver, url, output_dir)
     except Exception as e:
         logging.error(f"Error in main execution: {e}")
     finally:
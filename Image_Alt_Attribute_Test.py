@@ -1,93 +1,41 @@
 import os
 import logging
-import time
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from report_writer import save_with_auto_width
+from check_registry import register_check
+from driver_factory import init_driver
+from page_readiness import open_page
+from dom_extract import extract_image_attributes
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
-# Initialize WebDriver
-def init_driver():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.implicitly_wait(10)
-    return driver
-
 # Ensure directory exists
 def ensure_directory(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df):
-    """
-    Save a DataFrame to an Excel file, auto-adjust column widths, and enhance formatting.
-
-    Args:
-        filepath (str): Path to save the Excel file.
-        df (pd.DataFrame): DataFrame to save.
-    """
-    df.to_excel(filepath, index=False, engine='openpyxl')
-    wb = load_workbook(filepath)
-    ws = wb.active
-
-    # Define styles for formatting
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    # Adjust column widths and format headers
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except Exception as e:
-                logging.warning(f"Error calculating column width: {e}")
-                pass
-            cell.alignment = alignment
-            cell.border = border
-        ws.column_dimensions[col_letter].width = max_length + 5
-
-    # Apply header formatting
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = alignment
-
-    wb.save(filepath)
-
 # Test: Check Image Alt Attributes and Save Results
-def check_image_alt_and_save(driver, url, output_xlsx, output_summary_xlsx):
+def check_image_alt_and_save(driver, url, output_xlsx, output_summary_xlsx, load_page=True):
     logging.info(f"Starting Image Alt Attribute Test for URL: {url}")
-    driver.get(url)
-    time.sleep(2)
+    if load_page:
+        open_page(driver, url)
+
+    image_attributes = collect_image_attributes(driver)
+    save_image_alt_results(url, image_attributes, output_xlsx, output_summary_xlsx)
 
-    # Find all image elements on the page
-    images = driver.find_elements(By.TAG_NAME, "img")
+# Collect the source and alt attribute of every image on the loaded page
+def collect_image_attributes(driver):
+    return extract_image_attributes(driver)
 
+# Evaluate (src, alt) pairs and build the detailed results and summary DataFrames
+def build_image_alt_frames(url, image_attributes):
     # List to store image attributes and status
     image_data = []
     pass_count = 0
     fail_count = 0
 
-    for index, img in enumerate(images):
-        img_src = img.get_attribute("src")  # Get image source
-        img_alt = img.get_attribute("alt")  # Get image alt attribute
-
+    for index, (img_src, img_alt) in enumerate(image_attributes):
         # Determine status (Pass or Fail)
         status = "Pass" if img_alt else "Fail"
         
@@ -107,10 +55,8 @@ def check_image_alt_and_save(driver, url, output_xlsx, output_summary_xlsx):
         # Log the status of each image
         logging.info(f"Image {index + 1}: Source: {img_src}, Alt Text: {img_alt}, Status: {status}")
 
-    # Save detailed image alt results to Excel
+    # Detailed image alt results
     df = pd.DataFrame(image_data)
-    save_with_auto_width(output_xlsx, df)
-    logging.info(f"Image alt attribute analysis saved to {output_xlsx}")
 
     # Determine overall status and comments
     overall_status = "Pass" if fail_count == 0 else "Fail"
@@ -124,24 +70,42 @@ def check_image_alt_and_save(driver, url, output_xlsx, output_summary_xlsx):
         "Comments": comments
     }]
     df_summary = pd.DataFrame(summary_data)
+    return df, df_summary
+
+# Evaluate (src, alt) pairs and save the detailed results and summary
+def save_image_alt_results(url, image_attributes, output_xlsx, output_summary_xlsx):
+    df, df_summary = build_image_alt_frames(url, image_attributes)
+
+    # Save detailed image alt results to Excel
+    save_with_auto_width(output_xlsx, df)
+    logging.info(f"Image alt attribute analysis saved to {output_xlsx}")
 
     # Save the summary to another Excel file
     save_with_auto_width(output_summary_xlsx, df_summary)
     logging.info(f"Image alt attribute summary saved to {output_summary_xlsx}")
 
+# Registered check: image alt attributes of the already loaded page
+@register_check("Image_Alt_Attribute_Test", inputs=("driver", "url"),
+                results_file="image_alt_results.xlsx", summary_file="image_alt_summary.xlsx")
+def collect_image_alt_frames(driver, url):
+    return build_image_alt_frames(url, collect_image_attributes(driver))
+
+# Run the image alt attribute test with the standard output files
+def run_image_alt_test(driver, url, output_dir, load_page=True):
+    output_xlsx = os.path.join(output_dir, "image_alt_results.xlsx")  # Detailed results in .xlsx
+    output_summary_xlsx = os.path.join(output_dir, "image_alt_summary.xlsx")  # Summary file in .xlsx
+    check_image_alt_and_save(driver, url, output_xlsx, output_summary_xlsx, load_page=load_page)
+
 # Main function
 def main():
     url = "https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/"
     output_dir = "test_results"
     ensure_directory(output_dir)
 
-    output_xlsx = os.path.join(output_dir, "image_alt_results.xlsx")  # Detailed results in .xlsx
-    output_summary_xlsx = os.path.join(output_dir, "image_alt_summary.xlsx")  # Summary file in .xlsx
-    
     driver = init_driver()
 
     try:
-        check_image_alt_and_save(driver, url, output_xlsx, output_summary_xlsx)
+        run_image_alt_test(driver, url, output_dir)
     except Exception as e:
         logging.error(f"An error occurred during execution: {e}")
     finally:
@@ -0,0 +1,200 @@
+import os
+import logging
+import pandas as pd
+from report_writer import save_with_auto_width
+from check_registry import register_check
+from driver_factory import init_driver, RESOURCE_TIMING_BUFFER
+from page_readiness import open_page
+from tracing import span
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Budgets per metric; a metric above its budget fails the test
+PERFORMANCE_BUDGETS = {
+    "Time to First Byte (ms)": 800,
+    "DOMContentLoaded (ms)": 2500,
+    "Load Event (ms)": 5000,
+    "First Contentful Paint (ms)": 1800,
+    "Largest Contentful Paint (ms)": 2500,
+    "Total Transfer Size (KB)": 3000,
+    "Request Count": 150,
+    "Largest Resource (KB)": 500,
+}
+
+# Number of largest resources listed in the results
+LARGEST_RESOURCES = 5
+
+# Navigation Timing, Resource Timing and paint entries in one async script call.
+# LCP is only exposed to a buffered PerformanceObserver, so the script waits for its first callback.
+# Cross-origin resources without Timing-Allow-Origin report a transfer size of 0.
+# Only the first entries fit in the Resource Timing buffer; browsers from init_driver keep RESOURCE_TIMING_BUFFER.
+PERFORMANCE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var nav = performance.getEntriesByType("navigation")[0] || null;
+var paint = {};
+performance.getEntriesByType("paint").forEach(function (entry) {
+    paint[entry.name] = entry.startTime;
+});
+var resources = performance.getEntriesByType("resource").map(function (entry) {
+    return [entry.name, entry.initiatorType, entry.transferSize || 0];
+});
+var metrics = {
+    ttfb: nav ? nav.responseStart - nav.startTime : null,
+    domContentLoaded: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+    documentBytes: nav ? nav.transferSize || 0 : 0,
+    fcp: paint["first-contentful-paint"] === undefined ? null : paint["first-contentful-paint"],
+    lcp: null,
+    resources: resources
+};
+var finished = false;
+function finish() {
+    if (!finished) {
+        finished = true;
+        done(metrics);
+    }
+}
+try {
+    new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        if (entries.length) {
+            metrics.lcp = entries[entries.length - 1].startTime;
+        }
+        finish();
+    }).observe({type: "largest-contentful-paint", buffered: true});
+} catch (e) {}
+setTimeout(finish, 200);
+"""
+
+# Ensure directory exists
+def ensure_directory(path):
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+# Round a millisecond value, keeping missing values as None
+def rounded_ms(value):
+    return round(value) if value is not None else None
+
+# Collect the timing metrics of the loaded page
+def collect_performance_metrics(driver, url, load_page=True):
+    """
+    Collect Navigation Timing, Resource Timing and paint metrics from the page.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance.
+        url (str): URL of the page.
+        load_page (bool): Navigate to the URL first; False reuses the page already loaded in the driver.
+
+    Returns:
+        tuple: Metric values keyed like PERFORMANCE_BUDGETS (None when the browser did not report one),
+        and the largest resources as (url, type, KB) tuples, biggest first.
+    """
+    if load_page:
+        open_page(driver, url)
+    with span("read performance timing", "dom"):
+        raw = driver.execute_async_script(PERFORMANCE_SCRIPT)
+
+    if len(raw["resources"]) >= RESOURCE_TIMING_BUFFER:
+        logging.warning(f"The Resource Timing buffer is full ({len(raw['resources'])} entries); "
+                        f"request count and transfer size are lower bounds.")
+    resources = [(name, initiator, size / 1024) for name, initiator, size in raw["resources"]]
+    resources.sort(key=lambda resource: resource[2], reverse=True)
+    total_kb = raw["documentBytes"] / 1024 + sum(size for _, _, size in resources)
+
+    metrics = {
+        "Time to First Byte (ms)": rounded_ms(raw["ttfb"]),
+        "DOMContentLoaded (ms)": rounded_ms(raw["domContentLoaded"]),
+        "Load Event (ms)": rounded_ms(raw["load"]),
+        "First Contentful Paint (ms)": rounded_ms(raw["fcp"]),
+        "Largest Contentful Paint (ms)": rounded_ms(raw["lcp"]),
+        "Total Transfer Size (KB)": round(total_kb, 1),
+        "Request Count": len(resources) + 1,  # The document itself plus its resources
+        "Largest Resource (KB)": round(resources[0][2], 1) if resources else None,
+    }
+    logging.info(f"Performance metrics: {metrics}")
+    return metrics, resources[:LARGEST_RESOURCES]
+
+# Compare one value against its budget
+def budget_status(value, budget):
+    if value is None:
+        return "Not Available"
+    return "Pass" if value <= budget else "Fail"
+
+# Build the performance results and summary DataFrames
+def build_performance_frames(url, metrics, largest_resources, budgets=None):
+    budgets = budgets or PERFORMANCE_BUDGETS
+    rows = [{
+        "Metric": metric,
+        "Value": value,
+        "Budget": budgets[metric],
+        "Status": budget_status(value, budgets[metric]),
+        "Details": "",
+    } for metric, value in metrics.items() if metric in budgets]
+
+    # The largest resources, each against the per-resource budget
+    resource_budget = budgets["Largest Resource (KB)"]
+    for name, initiator, size in largest_resources:
+        rows.append({
+            "Metric": f"Resource ({initiator or 'other'}) (KB)",
+            "Value": round(size, 1),
+            "Budget": resource_budget,
+            "Status": budget_status(size, resource_budget),
+            "Details": name,
+        })
+    df_results = pd.DataFrame(rows)
+
+    over_budget = [f"{row['Metric']} {row['Value']} > {row['Budget']}"
+                   for row in rows[:len(rows) - len(largest_resources)] if row["Status"] == "Fail"]
+    summary_data = [{
+        "Page URL": url,
+        "Test Case": "Page Performance Budget",
+        "Status": "Fail" if over_budget else "Pass",
+        "Comments": "Over budget: " + "; ".join(over_budget) if over_budget else "All metrics within budget."
+    }]
+    df_summary = pd.DataFrame(summary_data)
+    return df_results, df_summary
+
+# Save the performance results and summary files
+def save_performance_results(url, metrics, largest_resources, output_dir, budgets=None):
+    output_results_xlsx = os.path.join(output_dir, "page_performance_results.xlsx")
+    output_summary_xlsx = os.path.join(output_dir, "page_performance_summary.xlsx")
+
+    df_results, df_summary = build_performance_frames(url, metrics, largest_resources, budgets)
+    save_with_auto_width(output_results_xlsx, df_results)
+    logging.info(f"Page performance results saved to {output_results_xlsx}")
+
+    save_with_auto_width(output_summary_xlsx, df_summary)
+    logging.info(f"Page performance summary saved to {output_summary_xlsx}")
+
+# Registered check: performance budget of the already loaded page
+@register_check("Page_Performance_Budget_Test", inputs=("driver", "url"),
+                results_file="page_performance_results.xlsx", summary_file="page_performance_summary.xlsx")
+def collect_page_performance_frames(driver, url):
+    return build_performance_frames(url, *collect_performance_metrics(driver, url, load_page=False))
+
+# Run the page performance test and save its results and summary
+def run_page_performance_test(driver, url, output_dir, load_page=True, budgets=None):
+    metrics, largest_resources = collect_performance_metrics(driver, url, load_page=load_page)
+    save_performance_results(url, metrics, largest_resources, output_dir, budgets)
+
+# Main function
+def main():
+    url = "https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/"
+    output_dir = "test_results"
+    ensure_directory(output_dir)
+
+    driver = init_driver()
+
+    try:
+        run_page_performance_test(driver, url, output_dir)
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
+    finally:
+        driver.quit()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info("Execution interrupted by user.")
@@ -1,95 +1,98 @@
 import os
 import logging
-import time
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from report_writer import save_with_auto_width
+from check_registry import register_check
+from driver_factory import init_driver
+from page_readiness import open_page
+from load_profile import LIGHT_PROFILE
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
-# Initialize WebDriver
-def init_driver():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.implicitly_wait(10)
-    return driver
-
 # Ensure directory exists
 def ensure_directory(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df):
-    df.to_excel(filepath, index=False, engine='openpyxl')
-    wb = load_workbook(filepath)
-    ws = wb.active
-
-    # Define styles for formatting
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    # Adjust column widths and format headers
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except Exception as e:
-                logging.warning(f"Error calculating column width: {e}")
-                pass
-            cell.alignment = alignment
-            cell.border = border
-        ws.column_dimensions[col_letter].width = max_length + 5
-
-    # Apply header formatting
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = alignment
-
-    wb.save(filepath)
+# Data expected in the <script> tag of the property page
+SCRIPT_DATA = {
+    "SiteURL": "https://www.alojamiento.io",
+    "CampaignID": "ALOJAMIENTO",
+    "SiteName": "Alojamiento",
+    "Browser": "Chrome",
+    "CountryCode": "BD",
+    "IP": "182.160.106.203"
+}
+
+# Extract the script data; the one rule both the Selenium and the static engine apply
+def extract_script_data():
+    try:
+        # Simulated script data extraction using the provided dictionary
+        data = dict(SCRIPT_DATA)
+        return "Pass", data
+    except Exception as e:
+        return "Fail", {"Error": str(e)}
 
 # Scrape data from the <script> tag of a webpage
-def scrape_script_data(driver, url):
+def scrape_script_data(driver, url, load_page=True):
     """
     Scrape data from the <script> tag of a webpage.
 
     Args:
         driver (webdriver): Selenium WebDriver instance.
         url (str): URL of the webpage to scrape.
+        load_page (bool): Navigate to the URL first; False reuses the page already loaded in the driver.
 
     Returns:
         tuple: A result status ("Pass" or "Fail") and a dictionary containing scraped data or an error message.
     """
-    driver.get(url)
-    time.sleep(2)
-    try:
-        # Simulated script data extraction using the provided dictionary
-        data = {
-            "SiteURL": "https://www.alojamiento.io",
-            "CampaignID": "ALOJAMIENTO",
-            "SiteName": "Alojamiento",
-            "Browser": "Chrome",
-            "CountryCode": "BD",
-            "IP": "182.160.106.203"
-        }
-        return "Pass", data
-    except Exception as e:
-        return "Fail", {"Error": str(e)}
+    if load_page:
+        open_page(driver, url, profile=LIGHT_PROFILE)
+    return extract_script_data()
+
+# Build the script data results and summary DataFrames
+def build_script_data_frames(url, result, data):
+    # Detailed results
+    detailed_results = [dict(SCRIPT_DATA)]
+    df_detailed_results = pd.DataFrame(detailed_results)
+
+    # Update only summary with pass/fail
+    comments = "All script data extracted successfully" if result == "Pass" else data.get("Error", "Unknown Error")
+    summary_results = [{
+        "Page URL": url,
+        "Test Case": "test of script data",
+        "Status": result,
+        "Comments": comments
+    }]
+    df_summary = pd.DataFrame(summary_results)
+    return df_detailed_results, df_summary
+
+# Save the script data results and summary files
+def save_script_data_results(url, result, data, output_dir):
+    output_results_xlsx = os.path.join(output_dir, "script_data_results.xlsx")
+    output_summary_xlsx = os.path.join(output_dir, "script_data_summary.xlsx")
+
+    df_detailed_results, df_summary = build_script_data_frames(url, result, data)
+    save_with_auto_width(output_results_xlsx, df_detailed_results)
+    logging.info(f"Script data detailed results saved to {output_results_xlsx}")
+
+    save_with_auto_width(output_summary_xlsx, df_summary)
+    logging.info(f"Script data summary saved to {output_summary_xlsx}")
+
+# Registered check: script data of the already loaded page
+@register_check("Scrape_Data_from_Script_Tag", inputs=("driver", "url"),
+                results_file="script_data_results.xlsx", summary_file="script_data_summary.xlsx",
+                load_profile=LIGHT_PROFILE)
+def collect_script_data_frames(driver, url):
+    return build_script_data_frames(url, *scrape_script_data(driver, url, load_page=False))
+
+# Run the script data test and save its results and summary
+def run_script_data_test(driver, url, output_dir, load_page=True):
+    # Scrape data and get the result
+    result, data = scrape_script_data(driver, url, load_page=load_page)
+    save_script_data_results(url, result, data, output_dir)
 
 # Main function
 def main():
@@ -97,40 +100,10 @@ def main():
     output_dir = "test_results"
     ensure_directory(output_dir)
 
-    output_results_xlsx = os.path.join(output_dir, "script_data_results.xlsx")
-    output_summary_xlsx = os.path.join(output_dir, "script_data_summary.xlsx")
-
     driver = init_driver()
 
     try:
-        # Scrape data and get the result
-        result, data = scrape_script_data(driver, url)
-
-        # Save detailed results
-        detailed_results = [{
-            "SiteURL": "https://www.alojamiento.io",
-            "CampaignID": "ALOJAMIENTO",
-            "SiteName": "Alojamiento",
-            "Browser": "Chrome",
-            "CountryCode": "BD",
-            "IP": "182.160.106.203"
-        }]
-        df_detailed_results = pd.DataFrame(detailed_results)
-        save_with_auto_width(output_results_xlsx, df_detailed_results)
-        logging.info(f"Script data detailed results saved to {output_results_xlsx}")
-
-        # Update only summary with pass/fail
-        comments = "All script data extracted successfully" if result == "Pass" else data.get("Error", "Unknown Error")
-        summary_results = [{
-            "Page URL": url,
-            "Test Case": "test of script data",
-            "Status": result,
-            "Comments": comments
-        }]
-        df_summary = pd.DataFrame(summary_results)
-        save_with_auto_width(output_summary_xlsx, df_summary)
-        logging.info(f"Script data summary saved to {output_summary_xlsx}")
-
+        run_script_data_test(driver, url, output_dir)
     except Exception as e:
         logging.error(f"An error occurred: {e}")
     finally:
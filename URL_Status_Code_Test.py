@@ -1,17 +1,18 @@
 import os
-import time
 import requests
 import logging
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import urllib3
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from link_checker import check_links, status_row, MAX_WORKERS, PER_HOST_LIMIT, PROBE_MODE, LINK_CHECK_DEADLINE
+from link_cache import LinkStatusCache, CACHE_TTL, normalize_url
+from network_log import read_network_statuses
+from http_cassette import CassetteAdapter
+from report_writer import save_with_auto_width
+from check_registry import register_check
+from driver_factory import init_driver
+from page_readiness import open_page
+from dom_extract import extract_links
 
 # Disable insecure request warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -19,126 +20,95 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
-# Initialize WebDriver
-def init_driver():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.implicitly_wait(10)
-    return driver
-
 # Ensure directory exists
 def ensure_directory(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df):
-    df.to_excel(filepath, index=False, engine='openpyxl')
-    wb = load_workbook(filepath)
-    ws = wb.active
-
-    # Define styles for formatting
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    # Adjust column widths and format headers
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except Exception as e:
-                logging.warning(f"Error calculating column width: {e}")
-                pass
-            cell.alignment = alignment
-            cell.border = border
-        ws.column_dimensions[col_letter].width = max_length + 5
-
-    # Apply header formatting
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = alignment
-
-    wb.save(filepath)
-
-# Test: Check URL Status Codes and Save
-def check_url_status_and_save(driver, url, output_xlsx, output_summary_xlsx):
-    logging.info(f"Starting URL Status Test for URL: {url}")
-    driver.get(url)
-    time.sleep(2)
-
-    # Extract all unique anchor links
-    links = [a.get_attribute("href") for a in driver.find_elements(By.TAG_NAME, "a") if a.get_attribute("href")]
+# Extract all unique http(s) anchor links from the loaded page
+def collect_page_links(driver):
+    links = extract_links(driver)
     links = list(set(link for link in links if link and link.startswith("http")))
 
     logging.info(f"Found {len(links)} unique links on the page.")
-
-    # Set up a session with retries
+    return links
+
+# Result rows for failed page resources (images, scripts, ...) that are not anchor links
+def resource_failure_rows(browser_statuses, links):
+    anchors = {normalize_url(link) for link in links}
+    rows = []
+    for key, request in browser_statuses.items():
+        if key not in anchors and request["Status Code"] and request["Status Code"] >= 400:
+            row = status_row(request["URL"], request["Status Code"])
+            row["Source"] = f"Page resource ({request['Resource Type'] or 'Other'})"
+            rows.append(row)
+    return rows
+
+# Session for link checking, pooled for concurrent requests and optionally over a cassette
+def build_link_session(max_workers=MAX_WORKERS, cassette=None):
+    # No adapter retries: check_links retries every scheme under the run's RetryPolicy
     session = requests.Session()
-    retries = Retry(total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-    session.mount('https://', HTTPAdapter(max_retries=retries))
-
-    # Store link details
-    link_data = []
-    pass_count = 0
-    fail_count = 0
-    failed_urls = []
-
+    pool_sizes = {"pool_connections": max_workers, "pool_maxsize": max_workers}
+    for prefix in ('https://', 'http://'):
+        if cassette is None:
+            session.mount(prefix, HTTPAdapter(**pool_sizes))
+        else:
+            session.mount(prefix, CassetteAdapter(cassette, **pool_sizes))
+    return session
+
+# Check link status codes and return one result row per link
+def check_page_links(links, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT, deadline=LINK_CHECK_DEADLINE,
+                     cache=None, browser_statuses=None, cassette=None, scheduler=None, retry_policy=None, probe_mode=PROBE_MODE):
+    """
+    Check link status codes, reusing the ones the browser already saw while loading the page.
+
+    Args:
+        links (list): Anchor URLs to check.
+        deadline (float): Seconds allowed for probing the links; links not checked in time are
+            reported as failed. None means no limit.
+        browser_statuses (dict): Requests from the browser's network log (read_network_statuses).
+            Links with a response there are not requested again, and failed page resources are
+            added as extra rows.
+        cassette (Cassette): Record the link requests into, or replay them from, an HTTP cassette.
+            Browser statuses are ignored then, so every link goes through the cassette.
+        scheduler (HostScheduler): Per-host rate and concurrency control shared across pages.
+        retry_policy (RetryPolicy): Retry deadline and budget shared across pages.
+        probe_mode (str): PROBE_HEAD reads only status lines and headers; PROBE_GET downloads every body.
+
+    Returns:
+        list: Result rows for every link, followed by rows for failed page resources.
+    """
+    browser_statuses = browser_statuses if cassette is None and browser_statuses else {}
+    seen_rows = {}
+    to_probe = []
     for link in links:
-        status = "Pass"
-        error_message = ""
-        status_code = ""
-
-        try:
-            response = session.get(link, timeout=5, verify=False)
-            status_code = response.status_code
-            if status_code == 404:
-                status = "Fail"
-                error_message = "404 Not Found"
-                fail_count += 1
-                failed_urls.append(link)  # Add to failed URLs only if 404
-                any_404_error = True
-            else:
-                status = "pass"
-                pass_count += 1
-        except requests.exceptions.Timeout:
-            status = "Fail"
-            error_message = "Timeout"
-            fail_count += 1
-        except requests.exceptions.RequestException as e:
-            status = "Fail"
-            error_message = f"Error: {e}"
-            fail_count += 1
-
-        link_data.append({
-            "URL": link,
-            "Status": status,
-            "HTTP Status Code": status_code if status_code else "N/A",
-            "Error Message": error_message if error_message else "None"
-        })
-
-        logging.info(f"Checked URL: {link}, Status: {status}, HTTP Code: {status_code}, Error: {error_message}")
-    
+        request = browser_statuses.get(normalize_url(link))
+        if request and request["Status Code"]:
+            seen_rows[link] = dict(status_row(link, request["Status Code"]), Source="Browser")
+        else:
+            to_probe.append(link)
+    logging.info(f"{len(seen_rows)} link statuses taken from the browser, {len(to_probe)} links to probe.")
+
+    # Check the remaining links concurrently and store link details
+    session = build_link_session(max_workers, cassette)
+    probed = check_links(session, to_probe, max_workers=max_workers, per_host_limit=per_host_limit,
+                         deadline=deadline, cache=cache, scheduler=scheduler, retry_policy=retry_policy,
+                         probe_mode=probe_mode)
+    probed_rows = {link: dict(row, Source="Request") for link, row in zip(to_probe, probed)}
+    link_data = [seen_rows.get(link) or probed_rows[link] for link in links]
+    link_data += resource_failure_rows(browser_statuses, links)
+
     # Check after all URLs if none are 404, change all statuses to "Pass"
     if not any(item["HTTP Status Code"] == 404 for item in link_data):
         for item in link_data:
             item["Status"] = "Pass"
-    
-    # Save detailed URL status results
+    return link_data
+
+# Build the URL status results and summary DataFrames
+def build_url_status_frames(url, link_data):
     df_links = pd.DataFrame(link_data)
-    save_with_auto_width(output_xlsx, df_links)
     overall_status = "Pass" if all(link['Status'] == "Pass" for link in link_data) else "Fail"
-    logging.info(f"Detailed URL status analysis saved to {output_xlsx}")
-    
+
     # Define comments based on test results
     if overall_status == "Pass":
         comments = "All URLs passed successfully."
@@ -153,22 +123,67 @@ def check_url_status_and_save(driver, url, output_xlsx, output_summary_xlsx):
         "Comments": comments
     }]
     df_summary = pd.DataFrame(summary_data)
+    return df_links, df_summary
+
+# Test: Check URL Status Codes and Save
+def check_url_status_and_save(driver, url, output_xlsx, output_summary_xlsx, load_page=True,
+                              max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT, deadline=LINK_CHECK_DEADLINE,
+                              cache=None,
+                              cassette=None, retry_policy=None):
+    logging.info(f"Starting URL Status Test for URL: {url}")
+    if load_page:
+        open_page(driver, url)
+
+    links = collect_page_links(driver)
+    link_data = check_page_links(links, max_workers=max_workers, per_host_limit=per_host_limit, deadline=deadline,
+                                 cache=cache, browser_statuses=read_network_statuses(driver), cassette=cassette,
+                                 retry_policy=retry_policy)
+    df_links, df_summary = build_url_status_frames(url, link_data)
+
+    # Save detailed URL status results
+    save_with_auto_width(output_xlsx, df_links)
+    logging.info(f"Detailed URL status analysis saved to {output_xlsx}")
+
     save_with_auto_width(output_summary_xlsx, df_summary)
     logging.info(f"URL status summary saved to {output_summary_xlsx}")
 
+# Registered check: link status codes of the already loaded page
+@register_check("URL_Status_Code_Test", inputs=("driver", "driver_lock", "url", "cache", "cassette", "scheduler",
+                                        "retry_policy", "link_check_deadline"),
+                results_file="url_status_results.xlsx", summary_file="url_status_summary.xlsx")
+def collect_url_status_frames(driver, driver_lock, url, cache, cassette, scheduler, retry_policy, link_check_deadline):
+    # Only link extraction and the network log need the browser; probing runs alongside other checks
+    with driver_lock:
+        links = collect_page_links(driver)
+        browser_statuses = read_network_statuses(driver)
+    return build_url_status_frames(url, check_page_links(links, cache=cache, browser_statuses=browser_statuses,
+                                                         cassette=cassette, scheduler=scheduler,
+                                                         retry_policy=retry_policy,
+                                                         deadline=link_check_deadline or LINK_CHECK_DEADLINE))
+
+# Run the URL status test with the standard output files
+def run_url_status_test(driver, url, output_dir, load_page=True, use_cache=True, cache_ttl=CACHE_TTL):
+    output_xlsx = os.path.join(output_dir, "url_status_results.xlsx")
+    output_summary_xlsx = os.path.join(output_dir, "url_status_summary.xlsx")
+
+    # Reuse link statuses from previous runs when the cache is enabled
+    cache = LinkStatusCache(os.path.join(output_dir, "url_status_cache.db"), ttl=cache_ttl) if use_cache else None
+    try:
+        check_url_status_and_save(driver, url, output_xlsx, output_summary_xlsx, load_page=load_page, cache=cache)
+    finally:
+        if cache:
+            cache.close()
+
 # Main function
 def main():
     url = "https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/"
     output_dir = "test_results"
     ensure_directory(output_dir)
 
-    output_xlsx = os.path.join(output_dir, "url_status_results.xlsx")
-    output_summary_xlsx = os.path.join(output_dir, "url_status_summary.xlsx")
-
     driver = init_driver()
 
     try:
-        check_url_status_and_save(driver, url, output_xlsx, output_summary_xlsx)
+        run_url_status_test(driver, url, output_dir)
     except Exception as e:
         logging.error(f"An error occurred during execution: {e}")
     finally:
@@ -0,0 +1,243 @@
+import os
+import queue
+import shutil
+import logging
+import argparse
+import multiprocessing
+import tempfile
+import requests
+import xml.etree.ElementTree as ET
+
+from browser_pool import BrowserPool, MAX_PAGES_PER_BROWSER, MAX_BROWSER_MEMORY_MB
+from check_registry import load_checks, run_checks, page_load_profile
+from link_cache import LinkStatusCache
+from link_checker import PER_HOST_LIMIT, LINK_CHECK_DEADLINE
+from host_scheduler import HostScheduler
+from retry_policy import RetryPolicy
+from page_readiness import open_page
+from tracing import stream_trace, export_chrome_trace
+from report_writer import SpooledSheet
+from snapshot_store import SnapshotStore, capture_snapshot
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Ensure directory exists
+def ensure_directory(path):
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+# Read page URLs from a plain list file (one URL per line, '#' starts a comment)
+def read_url_list(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+# Read page URLs from a sitemap file or URL, following sitemap indexes
+def read_sitemap(source):
+    if source.startswith("http"):
+        response = requests.get(source, timeout=30)
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+    else:
+        root = ET.parse(source).getroot()
+
+    locations = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+    if root.tag.endswith("sitemapindex"):
+        urls = []
+        for child_sitemap in locations:
+            urls.extend(read_sitemap(child_sitemap))
+        return urls
+    return locations
+
+# Run the selected checks (all when None) against one page and return their CheckResult objects
+def check_page(driver, url, cache, checks=None, snapshots=None, scheduler=None, retry_policy=None,
+               link_check_deadline=LINK_CHECK_DEADLINE):
+    open_page(driver, url, profile=page_load_profile(checks))
+    if snapshots:
+        snapshots.save(url, capture_snapshot(driver))
+    context = {"driver": driver, "url": url, "cache": cache, "scheduler": scheduler, "retry_policy": retry_policy,
+               "link_check_deadline": link_check_deadline}
+    return run_checks(context, names=checks)
+
+# Worker process: a pooled browser, reset between pages and recycled, serving pages until it receives None
+def crawl_worker(task_queue, result_queue, cache_path, trace_dir,
+                 max_pages=MAX_PAGES_PER_BROWSER, max_memory_mb=MAX_BROWSER_MEMORY_MB, checks=None,
+                 snapshot_dir=None, link_deadline=None, link_check_deadline=LINK_CHECK_DEADLINE):
+    trace_file = os.path.join(trace_dir, f"crawl_trace_{os.getpid()}.json")
+    stream_trace(trace_file)
+    pool = BrowserPool(size=1, max_pages=max_pages, max_memory_mb=max_memory_mb)
+    cache = LinkStatusCache(cache_path) if cache_path else None
+    snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+    # Per-host link limits learned on one page carry over to the next pages of this worker
+    scheduler = HostScheduler(PER_HOST_LIMIT)
+    # Workers start together, so every worker's retry deadline ends about when the crawl's does
+    retry_policy = RetryPolicy(deadline=link_deadline)
+    try:
+        for url in iter(task_queue.get, None):
+            try:
+                with pool.browser() as driver:
+                    result_queue.put((url, check_page(driver, url, cache, checks, snapshots, scheduler,
+                                                           retry_policy, link_check_deadline)))
+            except Exception as e:
+                logging.error(f"Error checking page {url}: {e}")
+                result_queue.put((url, []))
+    finally:
+        if cache:
+            cache.close()
+        if snapshots:
+            snapshots.close()
+        pool.close()
+        scheduler.log_report()
+        retry_policy.log_report()
+        export_chrome_trace(trace_file)
+
+# Add the page URL as the first column of a results DataFrame
+def with_page_url(df, url):
+    if "Page URL" not in df.columns:
+        df = df.copy()
+        df.insert(0, "Page URL", url)
+    return df
+
+class AggregatedReport:
+    """
+    One results and one summary file per check, filled page by page.
+
+    Each page's rows are spooled to disk as soon as the page is added, so the DataFrames of finished
+    pages are not kept alive until the end of the crawl. save() writes every file in a single pass.
+
+    Args:
+        output_dir (str): Directory for the aggregated result files and the temporary spool files.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.checks = load_checks()
+        self.spool_dir = tempfile.mkdtemp(prefix="report_spool_", dir=output_dir)
+        self.sheets = {}
+
+    # Spooled sheet of one check's results or summary, created on first use
+    def sheet(self, name, kind):
+        if (name, kind) not in self.sheets:
+            self.sheets[(name, kind)] = SpooledSheet(os.path.join(self.spool_dir, f"{name}.{kind}.pickle"))
+        return self.sheets[(name, kind)]
+
+    # Spool the results of one page's checks
+    def add_page(self, url, check_results):
+        for result in check_results:
+            if result.name not in self.checks:
+                continue
+            if result.results is not None:
+                self.sheet(result.name, "results").append(with_page_url(result.results, url))
+            if result.summary is not None:
+                self.sheet(result.name, "summary").append(result.summary)
+
+    # Write the aggregated files of every check that produced rows, then remove the spool files
+    def save(self):
+        try:
+            for check in self.checks.values():
+                if (check.name, "results") in self.sheets:
+                    results_path = os.path.join(self.output_dir, check.results_file)
+                    self.sheets[(check.name, "results")].save(results_path, has_reason_column=check.has_reason_column)
+                    logging.info(f"Aggregated results saved to {results_path}")
+                if (check.name, "summary") in self.sheets:
+                    summary_path = os.path.join(self.output_dir, check.summary_file)
+                    self.sheets[(check.name, "summary")].save(summary_path)
+                    logging.info(f"Aggregated summary saved to {summary_path}")
+        finally:
+            self.close()
+
+    # Remove the spool files without writing the reports
+    def close(self):
+        for sheet in self.sheets.values():
+            sheet.close()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+# Combine per-page results and write one results and one summary file per check
+def save_aggregated_results(page_results, output_dir):
+    report = AggregatedReport(output_dir)
+    for url, check_results in page_results:
+        report.add_page(url, check_results)
+    report.save()
+
+# Spread pages across worker processes and aggregate their results
+def crawl(urls, output_dir, workers=None, use_cache=True,
+          max_pages=MAX_PAGES_PER_BROWSER, max_memory_mb=MAX_BROWSER_MEMORY_MB, checks=None, snapshot_dir=None,
+          link_deadline=None, link_check_deadline=LINK_CHECK_DEADLINE):
+    ensure_directory(output_dir)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(urls)))
+    cache_path = os.path.join(output_dir, "url_status_cache.db") if use_cache else None
+    logging.info(f"Crawling {len(urls)} pages with {workers} browser workers.")
+
+    task_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=crawl_worker, args=(task_queue, result_queue, cache_path, output_dir,
+                                                             max_pages, max_memory_mb, checks, snapshot_dir,
+                                                             link_deadline, link_check_deadline))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for url in urls:
+        task_queue.put(url)
+    for _ in processes:
+        task_queue.put(None)
+
+    # Keep the input order in the aggregated reports
+    results_by_url = {}
+    while len(results_by_url) < len(urls):
+        try:
+            url, check_results = result_queue.get(timeout=5)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                logging.error("All browser workers exited before every page was checked.")
+                break
+            continue
+        results_by_url[url] = check_results
+        logging.info(f"Checked page {len(results_by_url)}/{len(urls)}: {url}")
+
+    for process in processes:
+        process.join()
+
+    save_aggregated_results([(url, results_by_url.get(url, [])) for url in urls], output_dir)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Run all property page tests across many pages.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--url-file", help="File with one page URL per line")
+    source.add_argument("--sitemap", help="Sitemap file or URL listing the pages to check")
+    parser.add_argument("--workers", type=int, default=None, help="Number of browser worker processes (default: CPU count)")
+    parser.add_argument("--output-dir", default="test_results", help="Directory for the aggregated result files")
+    parser.add_argument("--no-cache", action="store_true", help="Check every link live instead of using the URL status cache")
+    parser.add_argument("--checks", type=lambda value: value.split(","), default=None,
+                        help="Comma-separated check names to run on every page (default: all)")
+    parser.add_argument("--record-snapshots", metavar="DIR", default=None,
+                        help="Save every page's rendered DOM to a snapshot store for snapshot_store.py replays")
+    parser.add_argument("--link-deadline", type=float, default=None,
+                        help="Seconds after which failing links are reported instead of retried")
+    parser.add_argument("--link-check-deadline", type=float, default=LINK_CHECK_DEADLINE,
+                        help="Seconds each page's link check may take; links not checked by then are reported as failed")
+    parser.add_argument("--recycle-after", type=int, default=MAX_PAGES_PER_BROWSER,
+                        help="Pages a browser serves before it is replaced")
+    parser.add_argument("--memory-limit", type=float, default=MAX_BROWSER_MEMORY_MB,
+                        help="Resident memory in MB of a browser's processes above which it is replaced")
+    args = parser.parse_args()
+
+    urls = read_url_list(args.url_file) if args.url_file else read_sitemap(args.sitemap)
+    # Drop duplicates while keeping the order
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        logging.warning("No page URLs to check.")
+        return
+
+    crawl(urls, args.output_dir, workers=args.workers, use_cache=not args.no_cache,
+          max_pages=args.recycle_after, max_memory_mb=args.memory_limit, checks=args.checks,
+          snapshot_dir=args.record_snapshots, link_deadline=args.link_deadline,
+          link_check_deadline=args.link_check_deadline)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info("Execution interrupted by user.")
@@ -0,0 +1,249 @@
+import os
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import pandas as pd
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from static_dom_checks import (parse_page, check_all_h1_tags_in_tree, check_html_sequence_in_tree,
+                               extract_image_attributes, scrape_script_data_from_tree)
+from report_writer import save_with_auto_width
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Currencies offered by the synthetic page: code -> symbol
+SYNTHETIC_CURRENCIES = {
+    "AE": "د.إ.", "AU": "$", "BD": "৳", "BE": "€", "CA": "$", "US": "$",
+    "GB": "£", "JP": "¥", "IN": "₹", "KR": "₩", "TR": "₺", "TH": "฿",
+    "PH": "₱", "VN": "₫", "NG": "₦", "IL": "₪", "UA": "₴", "PL": "zł",
+}
+
+# Page sizes at scale 1; every count is multiplied by the scale factor
+BASE_PAGE = {"links": 50, "images": 25, "headings": 12, "currencies": 6, "script_kb": 16}
+
+# Build a synthetic property page with the elements every check looks at
+def build_property_page(links, images, headings, currencies, script_kb, stub_base):
+    currency_codes = list(SYNTHETIC_CURRENCIES)[:currencies]
+    parts = ["<!DOCTYPE html><html><head><title>Synthetic property</title>"]
+    parts.append(f"<script>var ScriptData = {{\"payload\": \"{'x' * (script_kb * 1024)}\"}};</script>")
+    parts.append("</head><body><h1>Synthetic Property</h1>")
+
+    # Headings cycle through the levels so the sequence check has work to do
+    for index in range(headings):
+        level = 2 + index % 5
+        parts.append(f"<h{level}>Section {index + 1}</h{level}>")
+    for index in range(images):
+        alt = f' alt="Photo {index + 1}"' if index % 10 else ""
+        parts.append(f'<img src="/static/photo-{index + 1}.jpg"{alt}>')
+    for index in range(links):
+        parts.append(f'<a href="{stub_base}/stub/{index + 1}">Link {index + 1}</a>')
+
+    parts.append('<div class="property-tiles">$ 120</div><span class="js-price-value">$ 120</span>')
+    parts.append('<div id="js-currency-sort-footer">$</div><div class="select-wrap"><ul class="select-ul">')
+    for code in currency_codes:
+        parts.append(f'<li data-currency-country="{code}" data-symbol="{SYNTHETIC_CURRENCIES[code]}">{code}</li>')
+    parts.append("</ul></div>")
+    parts.append("""<script>
+document.querySelectorAll(".select-ul > li").forEach(function (li) {
+    li.addEventListener("click", function () {
+        var symbol = li.getAttribute("data-symbol");
+        document.getElementById("js-currency-sort-footer").textContent = symbol;
+        document.querySelectorAll(".property-tiles, .js-price-value").forEach(function (el) {
+            el.textContent = symbol + " 120";
+        });
+    });
+});
+</script></body></html>""")
+    return "".join(parts)
+
+# Request handler serving synthetic pages and link stubs with tunable latency and errors
+class BenchmarkHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    error_rate = 0.0
+    random = random.Random(0)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        parts = urlsplit(self.path)
+        if parts.path == "/page":
+            params = {key: int(values[0]) for key, values in parse_qs(parts.query).items()}
+            page = dict(BASE_PAGE, **params)
+            stub_base = f"http://{self.headers.get('Host')}"
+            self.send_body(200, "text/html; charset=utf-8", build_property_page(stub_base=stub_base, **page), send_body)
+        elif parts.path.startswith("/stub/"):
+            time.sleep(self.latency)
+            if self.random.random() < self.error_rate:
+                status = self.random.choice([404, 500, 503])
+            else:
+                status = 200
+            self.send_body(status, "text/html; charset=utf-8", f"<html><body>stub {parts.path}</body></html>", send_body)
+        else:
+            self.send_body(404, "text/plain", "Not Found", send_body)
+
+    def send_body(self, status, content_type, body, send_body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+# Start the synthetic server in a background thread and return (server, base URL)
+def start_server(latency=0.0, error_rate=0.0, port=0):
+    handler = type("ConfiguredBenchmarkHandler", (BenchmarkHandler,), {
+        "latency": latency, "error_rate": error_rate, "random": random.Random(0)
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# Page parameters for a scale factor
+def scaled_page(scale):
+    page = {key: value * scale for key, value in BASE_PAGE.items()}
+    page["currencies"] = min(page["currencies"], len(SYNTHETIC_CURRENCIES))
+    return page
+
+# Run a callable and return (seconds, peak Python memory in MB or None)
+def measure(func, args, track_memory=False):
+    # tracemalloc slows allocation-heavy code, so memory is only tracked on request
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func(*args)
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if track_memory else None
+        if track_memory:
+            tracemalloc.stop()
+    return seconds, peak
+
+# Checks that need no browser: the lxml engine and the link checker
+def static_benchmarks(page_url):
+    import requests
+    from URL_Status_Code_Test import check_page_links
+
+    html = requests.get(page_url, timeout=30).text
+    tree = parse_page(html)
+    links = [href for href in tree.xpath("//a/@href") if href.startswith("http")]
+    return [
+        ("parse_page", parse_page, (html,)),
+        ("check_all_h1_tags_in_tree", check_all_h1_tags_in_tree, (tree,)),
+        ("check_html_sequence_in_tree", check_html_sequence_in_tree, (tree,)),
+        ("extract_image_attributes", extract_image_attributes, (tree, page_url)),
+        ("scrape_script_data_from_tree", scrape_script_data_from_tree, (tree,)),
+        ("check_page_links", check_page_links, (links,)),
+    ]
+
+# The existing browser checks, each loading the page itself
+def browser_benchmarks(driver, page_url, page, output_dir):
+    from H1_Tag_Existence_Test import check_all_h1_tags
+    from HTML_Tag_Sequence_Test import check_html_sequence
+    from Image_Alt_Attribute_Test import check_image_alt_and_save
+    from URL_Status_Code_Test import check_url_status_and_save
+    from Scrape_Data_from_Script_Tag import scrape_script_data
+    from Currency_Filtering_Test import test_currency_filter
+
+    currency_list = {
+        code: {"Code": code, "Country": code, "Symbol": symbol}
+        for code, symbol in list(SYNTHETIC_CURRENCIES.items())[:page["currencies"]]
+    }
+    return [
+        ("check_all_h1_tags", check_all_h1_tags, (driver, page_url)),
+        ("check_html_sequence", check_html_sequence, (driver, page_url)),
+        ("check_image_alt_and_save", check_image_alt_and_save,
+         (driver, page_url, os.path.join(output_dir, "image_alt_results.xlsx"),
+          os.path.join(output_dir, "image_alt_summary.xlsx"))),
+        ("check_url_status_and_save", check_url_status_and_save,
+         (driver, page_url, os.path.join(output_dir, "url_status_results.xlsx"),
+          os.path.join(output_dir, "url_status_summary.xlsx"))),
+        ("scrape_script_data", scrape_script_data, (driver, page_url)),
+        ("test_currency_filter", test_currency_filter, (driver, page_url, currency_list)),
+    ]
+
+# Run every benchmark at every scale and return one row per (scale, check)
+def run_benchmarks(scales, browser=True, latency=0.0, error_rate=0.0, track_memory=False):
+    server, base_url = start_server(latency=latency, error_rate=error_rate)
+    driver = None
+    rows = []
+    try:
+        if browser:
+            from driver_factory import init_driver
+            driver = init_driver()
+
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            for scale in scales:
+                page = scaled_page(scale)
+                page_url = f"{base_url}/page?" + "&".join(f"{key}={value}" for key, value in page.items())
+                benchmarks = static_benchmarks(page_url)
+                if driver:
+                    benchmarks += browser_benchmarks(driver, page_url, page, scratch_dir)
+
+                for name, func, args in benchmarks:
+                    seconds, peak_mb = measure(func, args, track_memory=track_memory)
+                    logging.info(f"Scale {scale}: {name} took {seconds:.3f}s"
+                                 + (f", peak {peak_mb:.1f} MB" if peak_mb is not None else ""))
+                    rows.append({
+                        "Scale": scale,
+                        "Links": page["links"],
+                        "Images": page["images"],
+                        "Headings": page["headings"],
+                        "Currencies": page["currencies"],
+                        "Script KB": page["script_kb"],
+                        "Check": name,
+                        "Seconds": round(seconds, 4),
+                        "Peak Python Memory MB": round(peak_mb, 2) if peak_mb is not None else None,
+                    })
+    finally:
+        if driver:
+            driver.quit()
+        server.shutdown()
+    return pd.DataFrame(rows)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the checks against a local synthetic property page.")
+    parser.add_argument("--scales", default="1,2,4,8", help="Comma-separated page size multipliers")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds each link stub waits before answering")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of link stub requests answered with an error")
+    parser.add_argument("--no-browser", action="store_true", help="Only run the checks that need no browser")
+    parser.add_argument("--memory", action="store_true", help="Also record peak Python memory per check (slower)")
+    parser.add_argument("--output", default=os.path.join("test_results", "benchmark_results.xlsx"),
+                        help="Excel file for the benchmark table")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    df = run_benchmarks(scales, browser=not args.no_browser, latency=args.latency, error_rate=args.error_rate,
+                        track_memory=args.memory)
+
+    # Scaling curves: one column per scale, one row per check
+    curves = df.pivot_table(index="Check", columns="Scale", values="Seconds", sort=False)
+    logging.info(f"Seconds per check by scale:\n{curves.to_string()}")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    save_with_auto_width(args.output, df)
+    logging.info(f"Benchmark results saved to {args.output}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info("Execution interrupted by user.")
@@ -0,0 +1,220 @@
+import os
+import time
+import queue
+import logging
+import threading
+from dataclasses import dataclass
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+
+from driver_factory import init_driver, prewarm_driver
+from network_log import clear_network_log
+from tracing import span
+
+# Default pool settings
+MAX_PAGES_PER_BROWSER = 50  # Pages served before a browser is replaced
+MAX_BROWSER_MEMORY_MB = 2048  # Resident memory of chromedriver and its Chrome processes before a browser is replaced
+CHECKOUT_TIMEOUT = 300  # Seconds to wait for a free browser
+
+# Clears the state a page leaves behind for its origin: storage, and with it the remembered currency
+RESET_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+@dataclass
+class PooledBrowser:
+    """A WebDriver session owned by the pool."""
+    driver: object
+    pages: int = 0
+    created_at: float = 0.0
+
+# Process ids of a process and all of its descendants, read from /proc
+def process_tree(pid):
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so the fields are read after its closing parenthesis
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    tree = [pid]
+    for current in tree:
+        tree.extend(children.get(current, []))
+    return tree
+
+# Resident memory of one process in MB, 0 when it has exited
+def process_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return 0.0
+
+# Resident memory of chromedriver and every browser process it started in MB; None where /proc is unavailable
+def browser_memory_mb(driver):
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None or not os.path.isdir("/proc"):
+        return None
+    return sum(process_rss_mb(pid) for pid in process_tree(process.pid))
+
+# Check that a browser still answers and is left with a single window
+def is_healthy(driver):
+    try:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        return driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+# Quit a browser, ignoring sessions that already died
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
+class BrowserPool:
+    """
+    Pool of WebDriver sessions that are checked out per page and reused.
+
+    Browsers are reset between pages (cookies, local and session storage, open windows), health
+    checked before they are handed out, and replaced after `max_pages` pages or once the resident
+    memory of chromedriver and its Chrome processes exceeds `max_memory_mb`. Replacements are
+    pre-warmed so the next checkout does not wait for a cold start.
+
+    Args:
+        size (int): Maximum number of browsers.
+        max_pages (int): Pages served before a browser is recycled.
+        max_memory_mb (float): Memory limit before a browser is recycled.
+        headless (bool): Run without a window; defaults to the HEADLESS environment setting.
+    """
+
+    def __init__(self, size=1, max_pages=MAX_PAGES_PER_BROWSER, max_memory_mb=MAX_BROWSER_MEMORY_MB, headless=None):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.headless = headless
+        self.idle = queue.LifoQueue()
+        self.checked_out = {}
+        self.lock = threading.Lock()
+        self.created = 0
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    # Launch a new browser for the pool
+    def launch(self):
+        browser = PooledBrowser(driver=init_driver(self.headless), created_at=time.monotonic())
+        with self.lock:
+            self.stats["launched"] += 1
+        return browser
+
+    # Hand out a healthy browser, launching one while the pool is below its size
+    def checkout(self, timeout=CHECKOUT_TIMEOUT):
+        while True:
+            try:
+                browser = self.idle.get_nowait()
+            except queue.Empty:
+                with self.lock:
+                    can_launch = self.created < self.size
+                    if can_launch:
+                        self.created += 1
+                if can_launch:
+                    try:
+                        browser = self.launch()
+                    except Exception:
+                        with self.lock:
+                            self.created -= 1
+                        raise
+                else:
+                    try:
+                        browser = self.idle.get(timeout=timeout)
+                    except queue.Empty:
+                        raise TimeoutError(f"No browser became free within {timeout} seconds.")
+
+            with span("browser health check", "pool"):
+                healthy = is_healthy(browser.driver)
+            if healthy:
+                break
+            logging.warning("Discarding a browser that failed its health check.")
+            self.discard(browser, "unhealthy")
+
+        with self.lock:
+            if browser.pages:
+                self.stats["reused"] += 1
+            self.checked_out[id(browser.driver)] = browser
+        return browser.driver
+
+    # Take a browser back, resetting it for the next page or recycling it
+    def checkin(self, driver):
+        with self.lock:
+            browser = self.checked_out.pop(id(driver))
+        browser.pages += 1
+
+        memory_mb = browser_memory_mb(driver)
+        if browser.pages >= self.max_pages:
+            logging.info(f"Recycling browser after {browser.pages} pages.")
+            self.discard(browser, "recycled", prewarm=True)
+        elif memory_mb is not None and memory_mb > self.max_memory_mb:
+            logging.info(f"Recycling browser using {memory_mb:.0f} MB after {browser.pages} pages.")
+            self.discard(browser, "recycled", prewarm=True)
+        elif self.reset(driver):
+            self.idle.put(browser)
+        else:
+            self.discard(browser, "unhealthy")
+
+    # Clear cookies and storage and leave the browser on a blank page; False if the browser broke
+    def reset(self, driver):
+        with span("browser reset", "pool"):
+            try:
+                driver.delete_all_cookies()
+                driver.execute_script(RESET_STORAGE_JS)
+                driver.get("about:blank")
+                clear_network_log(driver)
+                return True
+            except WebDriverException as e:
+                logging.warning(f"Browser reset failed: {e.msg}")
+                return False
+
+    # Quit a browser and free its slot; a pre-warmed replacement is started when asked
+    def discard(self, browser, reason, prewarm=False):
+        quit_driver(browser.driver)
+        with self.lock:
+            self.created -= 1
+            self.stats[reason] += 1
+        if prewarm:
+            prewarm_driver(headless=self.headless)
+
+    # Check out a browser for the duration of a with-block
+    @contextmanager
+    def browser(self):
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    # Quit every idle browser and log the pool statistics
+    def close(self):
+        while True:
+            try:
+                browser = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            quit_driver(browser.driver)
+        with self.lock:
+            for browser in self.checked_out.values():
+                quit_driver(browser.driver)
+            self.checked_out.clear()
+            self.created = 0
+        logging.info(f"Browser pool: {self.stats['launched']} launched, {self.stats['reused']} reused, "
+                     f"{self.stats['recycled']} recycled, {self.stats['unhealthy']} unhealthy.")
@@ -0,0 +1,156 @@
+import os
+import time
+import logging
+import importlib
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+from report_writer import save_with_auto_width
+from tracing import span, test_scope
+from load_profile import FULL_PROFILE, profile_for
+
+# Modules that register checks when imported
+CHECK_MODULES = [
+    "H1_Tag_Existence_Test",
+    "HTML_Tag_Sequence_Test",
+    "Image_Alt_Attribute_Test",
+    "URL_Status_Code_Test",
+    "Scrape_Data_from_Script_Tag",
+    "Page_Performance_Budget_Test",
+    "Currency_Filtering_Test",
+]
+
+@dataclass
+class RegisteredCheck:
+    """A check callable with the inputs it needs and the report files it produces."""
+    name: str
+    func: callable
+    inputs: tuple
+    results_file: str
+    summary_file: str
+    has_reason_column: bool = False
+    mutates_page: bool = False
+    load_profile: str = FULL_PROFILE
+
+@dataclass
+class CheckResult:
+    """Structured outcome of one check run."""
+    name: str
+    status: str
+    comments: str
+    results: object = None  # Detailed results DataFrame, None when the check produced none
+    summary: object = None  # One-row summary DataFrame
+    duration: float = 0.0
+    error: str = None
+
+# Registry of checks by name, in registration order
+CHECKS = {}
+
+# Register a check callable returning (results DataFrame, summary DataFrame)
+def register_check(name, inputs, results_file, summary_file, has_reason_column=False, mutates_page=False,
+                   load_profile=FULL_PROFILE):
+    """
+    Decorator registering a check with the in-process runner.
+
+    Args:
+        name (str): Check name, matching the test module name.
+        inputs (tuple): Context keys passed to the check as keyword arguments
+            ("driver", "driver_lock", "url", "cache", "cassette", "scheduler",
+            "retry_policy", "link_check_deadline", "currency_workers").
+        results_file (str): File name of the detailed results.
+        summary_file (str): File name of the summary.
+        has_reason_column (bool): Format the results with the currency 'Message:' column.
+        mutates_page (bool): The check changes page state and runs after every other check.
+        load_profile (str): Resources the check needs: FULL_PROFILE, or LIGHT_PROFILE for markup only.
+    """
+    def decorator(func):
+        CHECKS[name] = RegisteredCheck(name, func, tuple(inputs), results_file, summary_file,
+                                       has_reason_column, mutates_page, load_profile)
+        return func
+    return decorator
+
+# Import every check module so its checks are registered
+def load_checks():
+    for module_name in CHECK_MODULES:
+        importlib.import_module(module_name)
+    return CHECKS
+
+# Load profile for a page shared by the named checks (every registered check when None)
+def page_load_profile(names=None):
+    load_checks()
+    return profile_for(check.load_profile for name, check in CHECKS.items() if names is None or name in names)
+
+# Run one check with its declared inputs taken from the context
+def run_check(check, context):
+    kwargs = {name: context.get(name) for name in check.inputs}
+
+    def call():
+        # Checks that do not manage the driver lock themselves hold it for their whole run
+        if "driver" in check.inputs and "driver_lock" not in check.inputs:
+            with context["driver_lock"]:
+                return check.func(**kwargs)
+        return check.func(**kwargs)
+
+    return timed_check(check.name, call)
+
+# Time a callable returning (results DataFrame, summary DataFrame) and wrap its outcome in a CheckResult
+def timed_check(name, call):
+    start = time.perf_counter()
+    try:
+        with test_scope(name), span(name, "check"):
+            results, summary = call()
+    except Exception as e:
+        logging.error(f"Error running {name}: {e}")
+        return CheckResult(name, "Fail", f"Error: {e}", duration=time.perf_counter() - start, error=str(e))
+
+    duration = time.perf_counter() - start
+    status = summary["Status"].iloc[0] if len(summary) else "Fail"
+    comments = summary["Comments"].iloc[0] if len(summary) else ""
+    logging.info(f"{name}: {status} in {duration:.2f}s")
+    return CheckResult(name, status, comments, results, summary, duration)
+
+# Run registered checks against an already loaded page
+def run_checks(context, names=None, workers=1):
+    """
+    Run the registered checks in this interpreter and return their results.
+
+    Args:
+        context (dict): Inputs available to the checks, e.g. driver, url and cache.
+        names (list): Names of the checks to run; None runs every registered check.
+        workers (int): Number of checks run at the same time. Browser access is serialized
+            through a shared lock, so parallel runs overlap network and report work.
+
+    Returns:
+        list: CheckResult objects in registration order.
+    """
+    load_checks()
+    checks = [check for name, check in CHECKS.items() if names is None or name in names]
+    context = dict(context, driver_lock=context.get("driver_lock") or threading.Lock())
+
+    # Checks that change the page run last, one at a time
+    independent = [check for check in checks if not check.mutates_page]
+    mutating = [check for check in checks if check.mutates_page]
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda check: run_check(check, context), independent))
+    else:
+        results = [run_check(check, context) for check in independent]
+    results.extend(run_check(check, context) for check in mutating)
+
+    order = list(CHECKS)
+    return sorted(results, key=lambda result: order.index(result.name))
+
+# Save the results and summary files of finished checks
+def save_check_results(results, output_dir):
+    for result in results:
+        check = CHECKS[result.name]
+        if result.results is not None:
+            results_path = os.path.join(output_dir, check.results_file)
+            save_with_auto_width(results_path, result.results, has_reason_column=check.has_reason_column)
+            logging.info(f"Test results saved to {results_path}")
+        if result.summary is not None:
+            summary_path = os.path.join(output_dir, check.summary_file)
+            save_with_auto_width(summary_path, result.summary)
+            logging.info(f"Summary saved to {summary_path}")
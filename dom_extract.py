@@ -0,0 +1,77 @@
+# Bulk DOM extraction: each function collects everything a check needs in one execute_script
+# round trip and returns plain Python data instead of WebElements.
+
+import json
+
+from tracing import span
+
+# Text of an element as Selenium reports it: empty for elements that are not rendered
+VISIBLE_TEXT_JS = """
+function visibleText(el) {
+    if (!el.getClientRects().length) {
+        return "";
+    }
+    return (el.innerText || "").trim();
+}
+"""
+
+# Key of an extraction in a recorded DOM snapshot
+def extraction_key(name, *args):
+    return name + (json.dumps(list(args)) if args else "")
+
+# Run an extraction script, or answer it from a recorded snapshot when the driver replays one
+def run_extraction(driver, name, script, *args):
+    replay = getattr(driver, "replay_extraction", None)
+    if replay is not None:
+        return replay(name, *args)
+    return driver.execute_script(script, *args)
+
+# Texts of every element matching a CSS selector, in document order
+def extract_texts(driver, selector):
+    with span("extract texts", "dom", selector=selector):
+        return run_extraction(driver, "texts", VISIBLE_TEXT_JS + """
+            return Array.from(document.querySelectorAll(arguments[0]), visibleText);
+        """, selector)
+
+# Texts of elements matching several CSS selectors: {selector: [texts]}
+def extract_texts_by_selector(driver, selectors):
+    with span("extract texts", "dom", selector=", ".join(selectors)):
+        return run_extraction(driver, "texts_by_selector", VISIBLE_TEXT_JS + """
+            var texts = {};
+            arguments[0].forEach(function (selector) {
+                texts[selector] = Array.from(document.querySelectorAll(selector), visibleText);
+            });
+            return texts;
+        """, list(selectors))
+
+# (tag name, text) of every h1-h6 header in document order
+def extract_headers(driver):
+    with span("extract headers", "dom"):
+        headers = run_extraction(driver, "headers", VISIBLE_TEXT_JS + """
+            return Array.from(document.querySelectorAll("h1, h2, h3, h4, h5, h6"), function (el) {
+                return [el.tagName.toLowerCase(), visibleText(el)];
+            });
+        """)
+    return [tuple(header) for header in headers]
+
+# (src, alt) of every image; src is the resolved absolute URL like WebElement.get_attribute("src")
+def extract_image_attributes(driver):
+    with span("extract images", "dom"):
+        images = run_extraction(driver, "images", """
+            return Array.from(document.getElementsByTagName("img"), function (img) {
+                return [img.src || null, img.getAttribute("alt")];
+            });
+        """)
+    return [tuple(image) for image in images]
+
+# Resolved href of every anchor that has one
+def extract_links(driver):
+    with span("extract links", "dom"):
+        return run_extraction(driver, "links", """
+            return Array.from(document.getElementsByTagName("a"), function (a) {
+                return a.href;
+            }).filter(function (href) {
+                // SVG anchors expose href as an object rather than a URL string
+                return typeof href === "string" && href;
+            });
+        """)
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+from tracing import span
+from network_log import LOGGING_PREFS, PERF_LOGGING_PREFS
+
+# Run Chrome without a window when HEADLESS=1 is set, e.g. on CI boxes
+HEADLESS = os.environ.get("HEADLESS", "").lower() in ("1", "true", "yes")
+IMPLICIT_WAIT = 0  # Lookups wait explicitly per query (element_lookup), so an empty result returns at once
+WINDOW_SIZE = "1920,1080"
+
+# Resource Timing entries each page keeps; Chrome's default of 250 would undercount busy pages
+RESOURCE_TIMING_BUFFER = 5000
+RESOURCE_TIMING_SCRIPT = f"performance.setResourceTimingBufferSize({RESOURCE_TIMING_BUFFER});"
+
+# Resolved chromedriver path, cached on disk so new processes skip ChromeDriverManager
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "assignment7", "chromedriver.json")
+DRIVER_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds before the driver is resolved again
+
+# Chrome flags that cut startup work the checks never need
+CHROME_FLAGS = [
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+    "--log-level=3",
+]
+
+DRIVER_PATH_LOCK = threading.Lock()
+_driver_path = None
+
+# Pre-warmed browsers: list of (headless, Future) launched in the background
+SPARE_LOCK = threading.Lock()
+_spares = []
+_prewarm_executor = None
+
+# Read the cached chromedriver path; None when missing, stale or no longer on disk
+def _read_cached_driver_path():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - cached.get("resolved_at", 0) > DRIVER_CACHE_TTL:
+        return None
+    path = cached.get("path")
+    return path if path and os.path.isfile(path) else None
+
+# Store the chromedriver path; written to a temp file first so concurrent processes never read half a file
+def _write_cached_driver_path(path):
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+        temp_file = f"{DRIVER_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"path": path, "resolved_at": time.time()}, f)
+        os.replace(temp_file, DRIVER_CACHE_FILE)
+    except OSError as e:
+        logging.warning(f"Could not cache the driver path: {e}")
+
+# Resolve the chromedriver binary once per process, and once per TTL across processes
+def resolve_driver_path(refresh=False):
+    global _driver_path
+    with DRIVER_PATH_LOCK:
+        if refresh:
+            _driver_path = None
+        elif _driver_path is None:
+            _driver_path = _read_cached_driver_path()
+
+        if _driver_path is None:
+            with span("driver install", "driver"):
+                _driver_path = ChromeDriverManager().install()
+            _write_cached_driver_path(_driver_path)
+        return _driver_path
+
+# Chrome options for the checks
+def chrome_options(headless=None):
+    options = Options()
+    for flag in CHROME_FLAGS:
+        options.add_argument(flag)
+    if HEADLESS if headless is None else headless:
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={WINDOW_SIZE}")
+    # Keep Chrome's own console logging out of the test output
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    # Record network events so link statuses can be read from the page load (network_log)
+    options.set_capability("goog:loggingPrefs", LOGGING_PREFS)
+    options.add_experimental_option("perfLoggingPrefs", PERF_LOGGING_PREFS)
+    return options
+
+# Launch a new browser session
+def launch_driver(headless=None):
+    driver_path = resolve_driver_path()
+    try:
+        with span("driver launch", "driver"):
+            driver = webdriver.Chrome(service=Service(driver_path, service_args=["--log-level=OFF"]),
+                                      options=chrome_options(headless))
+    except WebDriverException as e:
+        # A cached driver stops matching Chrome after a browser update: resolve it again once
+        logging.warning(f"Driver launch failed, resolving the driver again: {e.msg}")
+        driver_path = resolve_driver_path(refresh=True)
+        with span("driver launch", "driver"):
+            driver = webdriver.Chrome(service=Service(driver_path, service_args=["--log-level=OFF"]),
+                                      options=chrome_options(headless))
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    raise_resource_timing_buffer(driver)
+    return driver
+
+# Enlarge the Resource Timing buffer of every document the browser loads from now on
+def raise_resource_timing_buffer(driver):
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_TIMING_SCRIPT})
+    except (WebDriverException, AttributeError) as e:
+        logging.warning(f"Could not enlarge the Resource Timing buffer, pages keep 250 entries: {e}")
+
+# Start launching browsers in the background so the next init_driver() call gets a warm one
+def prewarm_driver(count=1, headless=None):
+    global _prewarm_executor
+    headless = HEADLESS if headless is None else headless
+    with SPARE_LOCK:
+        if _prewarm_executor is None:
+            _prewarm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prewarm")
+        for _ in range(count):
+            _spares.append((headless, _prewarm_executor.submit(launch_driver, headless)))
+
+# Take a pre-warmed browser matching the mode, or None when there is none
+def _take_spare(headless):
+    with SPARE_LOCK:
+        for index, (spare_headless, future) in enumerate(_spares):
+            if spare_headless == headless:
+                del _spares[index]
+                return future
+    return None
+
+# Initialize WebDriver
+def init_driver(headless=None):
+    """
+    Return a ready WebDriver, using a pre-warmed browser when one was started.
+
+    Args:
+        headless (bool): Run without a window; defaults to the HEADLESS environment setting.
+
+    Returns:
+        webdriver: Chrome WebDriver with the implicit wait applied.
+    """
+    headless = HEADLESS if headless is None else headless
+    spare = _take_spare(headless)
+    if spare is not None:
+        try:
+            with span("driver warm handoff", "driver"):
+                return spare.result()
+        except WebDriverException as e:
+            logging.warning(f"Pre-warmed browser failed to start, launching a new one: {e.msg}")
+    return launch_driver(headless)
+
+# Quit browsers that were pre-warmed but never used
+@atexit.register
+def discard_spares():
+    with SPARE_LOCK:
+        spares = [future for _, future in _spares]
+        _spares.clear()
+    for future in spares:
+        try:
+            future.result().quit()
+        except Exception:
+            pass
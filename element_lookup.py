@@ -0,0 +1,56 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from tracing import record_span
+
+# Drivers run without an implicit wait; every lookup that should wait says how long
+LOOKUP_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+
+# Timing table phases: lookups that found something, and lookups where absence was the answer
+FOUND_PHASE = "element lookup"
+ABSENT_PHASE = "element lookup (absent)"
+
+# Find every element matching a locator, waiting at most `timeout` seconds for the first match
+def find_all(scope, by, value, timeout=0, poll_interval=POLL_INTERVAL):
+    """
+    Look up elements with an explicit timeout; an empty list is a valid answer.
+
+    With the default timeout of 0 the lookup answers immediately, so a page that legitimately has
+    no matching elements is not held up. The time spent is recorded under FOUND_PHASE or
+    ABSENT_PHASE in the timing table.
+
+    Args:
+        scope (webdriver or WebElement): Driver or element to search in.
+        by (str): Selenium locator strategy, e.g. By.CSS_SELECTOR.
+        value (str): Locator value.
+        timeout (float): Seconds to keep polling while nothing matches.
+        poll_interval (float): Seconds between polls.
+
+    Returns:
+        list: Matching WebElements, empty when none appeared within the timeout.
+    """
+    start = time.perf_counter()
+    elements = scope.find_elements(by, value)
+    while not elements and time.perf_counter() - start < timeout:
+        time.sleep(poll_interval)
+        elements = scope.find_elements(by, value)
+    record_span(FOUND_PHASE if elements else ABSENT_PHASE, "lookup", start, time.perf_counter(), locator=value)
+    return elements
+
+# Wait for an expected condition; returns its value, or None when it did not hold within `timeout`
+def wait_until(driver, condition, timeout=LOOKUP_TIMEOUT, description="", poll_interval=POLL_INTERVAL):
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll_interval).until(condition)
+    except TimeoutException:
+        result = None
+    record_span(FOUND_PHASE if result else ABSENT_PHASE, "lookup", start, time.perf_counter(),
+                locator=description)
+    return result
+
+# Total seconds and count of lookups that came back empty, from a timing table
+def absent_lookup_totals(table):
+    absent = table[table["Phase"] == ABSENT_PHASE]
+    return int(absent["Count"].sum()), float(absent["Total Seconds"].sum())
@@ -0,0 +1,253 @@
+import time
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Default per-host limits
+HOST_RATE = None  # Hard cap in requests per second per host; None leaves hosts uncapped until they throttle
+HOST_BURST = 20  # Requests sent back to back before a rate limit applies
+MIN_HOST_RATE = 0.5
+RATE_STEP = 0.5  # Requests per second added to a host's rate limit after each good response
+
+# AIMD concurrency control: add about one slot per round of good responses, halve on overload
+DECREASE_FACTOR = 0.5
+LATENCY_SMOOTHING = 0.2  # Weight of the newest response in the smoothed latency
+LATENCY_TOLERANCE = 3.0  # Smoothed latency above this multiple of the fastest response means overload
+MIN_LATENCY_RISE = 0.2  # Seconds; smaller slowdowns are noise and never count as overload
+
+# Responses asking us to slow down, and how long to pause a host that sends one
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_PAUSE = 1.0  # Seconds, when the response has no Retry-After header
+MAX_RETRY_AFTER = 60.0
+
+# Hosts listed in the throughput report
+HOSTS_REPORTED = 10
+
+# Host part of a URL
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+# Seconds to wait from a Retry-After header (delay in seconds or HTTP date), or None
+def retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HostLimiter:
+    """Token bucket, adaptive concurrency limit and statistics of one host."""
+
+    def __init__(self, host, max_concurrency, max_rate, burst):
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.max_rate = max_rate
+        # No rate limit until the host throttles us, unless a hard cap is configured
+        self.rate = max_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.fastest = None
+        self.smoothed = None
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.latency_total = 0.0
+        self.responses = 0
+        self.bytes = 0
+        self.first_start = None
+        self.last_end = None
+
+    # Add the tokens earned since the last refill
+    def refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    # Seconds until a request may start: 0 now, None until a request in flight finishes
+    def wait_time(self, now):
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= max(1, int(self.limit)):
+            return None
+        if self.rate is not None and self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return 0
+
+    def start(self, now):
+        if self.rate is not None:
+            self.tokens -= 1
+        self.in_flight += 1
+        self.requests += 1
+        if self.first_start is None:
+            self.first_start = now
+
+    def finish(self, now):
+        self.in_flight -= 1
+        self.last_end = now
+
+    # Additive increase after a good response
+    def increase(self):
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        if self.rate is not None:
+            self.rate += RATE_STEP
+            if self.max_rate is not None:
+                self.rate = min(self.max_rate, self.rate)
+
+    # Request rate the host has been receiving, the starting point of a first rate limit
+    def observed_rate(self, now):
+        active = now - (self.first_start or now)
+        return self.requests / active if active > 0 else float(self.burst)
+
+    # Multiplicative decrease, at most once per smoothed round trip so one overload is not punished twice
+    def decrease(self, now):
+        if now - self.last_decrease < (self.smoothed or 0):
+            return
+        self.last_decrease = now
+        self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+        current = self.rate if self.rate is not None else self.observed_rate(now)
+        self.rate = max(MIN_HOST_RATE, current * DECREASE_FACTOR)
+        self.tokens = min(self.tokens, 1.0)
+
+    # Adapt the limits to a response that took `latency` seconds
+    def observe(self, now, status_code, latency, retry_after=None):
+        self.responses += 1
+        self.latency_total += latency
+        if status_code in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.decrease(now)
+            pause = THROTTLE_PAUSE if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+            self.paused_until = max(self.paused_until, now + pause)
+            return
+
+        self.fastest = latency if self.fastest is None else min(self.fastest, latency)
+        self.smoothed = latency if self.smoothed is None else (
+            LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self.smoothed)
+        if (self.smoothed > LATENCY_TOLERANCE * self.fastest
+                and self.smoothed - self.fastest > MIN_LATENCY_RISE):
+            self.decrease(now)
+        else:
+            self.increase()
+
+    # Throughput statistics for the report
+    def stats(self):
+        active = (self.last_end or 0) - (self.first_start or 0)
+        return {
+            "Host": self.host,
+            "Requests": self.requests,
+            "Throttled": self.throttled,
+            "Requests/s": round(self.requests / active, 2) if active > 0 else None,
+            "Average Latency (s)": round(self.latency_total / self.responses, 3) if self.responses else None,
+            "Bytes": self.bytes,
+            "Concurrency Limit": round(self.limit, 1),
+            "Rate Limit (req/s)": round(self.rate, 1) if self.rate is not None else None,
+        }
+
+class HostScheduler:
+    """
+    Per-host admission control for link probes.
+
+    Every host gets a concurrency limit adapted AIMD-style: each good response adds about one
+    slot per round of requests, while a 429/503, a timeout or a sharp rise in latency halves it.
+    Hosts are not rate limited until they push back; the first overload starts a token bucket at
+    half the rate the host was receiving, which then grows again with every good response. A
+    Retry-After header pauses the host for the requested time. Share one scheduler between
+    pages so what was learned about a host carries over.
+
+    Args:
+        max_concurrency (int): Most requests in flight per host.
+        max_rate (float): Hard cap in requests per second per host; None for no cap.
+        burst (int): Requests allowed back to back before the rate applies.
+    """
+
+    def __init__(self, max_concurrency, max_rate=HOST_RATE, burst=HOST_BURST):
+        self.max_concurrency = max_concurrency
+        self.max_rate = max_rate
+        self.burst = burst
+        self.condition = threading.Condition()
+        self.limiters = {}
+
+    # Limiter of a host, created on first use; call with the condition held
+    def limiter(self, host):
+        if host not in self.limiters:
+            self.limiters[host] = HostLimiter(host, self.max_concurrency, self.max_rate, self.burst)
+        return self.limiters[host]
+
+    # Wait until a request to the URL's host may start; returns False when `timeout` passes first
+    def acquire(self, url, timeout=None):
+        end_time = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            limiter = self.limiter(host_of(url))
+            while True:
+                now = time.monotonic()
+                limiter.refill(now)
+                wait = limiter.wait_time(now)
+                if wait == 0:
+                    limiter.start(now)
+                    return True
+                if end_time is not None:
+                    if now >= end_time:
+                        return False
+                    wait = end_time - now if wait is None else min(wait, end_time - now)
+                self.condition.wait(wait)
+
+    # Free the slot taken by acquire
+    def release(self, url):
+        with self.condition:
+            self.limiter(host_of(url)).finish(time.monotonic())
+            self.condition.notify_all()
+
+    # Response hook: adapt the limits of the responding host
+    def observe(self, response, *args, **kwargs):
+        retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+        with self.condition:
+            self.limiter(host_of(response.url)).observe(time.monotonic(), response.status_code,
+                                                        response.elapsed.total_seconds(), retry_after)
+            self.condition.notify_all()
+
+    # Count bytes received from the URL's host
+    def record_transfer(self, url, transferred):
+        with self.condition:
+            self.limiter(host_of(url)).bytes += transferred
+
+    # A request that timed out counts as overload of its host
+    def observe_timeout(self, url):
+        with self.condition:
+            self.limiter(host_of(url)).decrease(time.monotonic())
+
+    # Feed every response of a session, including redirect hops, into the scheduler
+    def attach(self, session):
+        hooks = session.hooks.setdefault("response", [])
+        if self.observe not in hooks:
+            hooks.append(self.observe)
+
+    # Throughput statistics per host, busiest first
+    def report(self):
+        with self.condition:
+            stats = [limiter.stats() for limiter in self.limiters.values() if limiter.requests]
+        return sorted(stats, key=lambda row: row["Requests"], reverse=True)
+
+    # Log the per-host throughput of the busiest hosts and the bytes received overall
+    def log_report(self, limit=HOSTS_REPORTED):
+        stats = self.report()
+        if stats:
+            logging.info(f"Link probes received {sum(row['Bytes'] for row in stats) / 1024:.1f} KB "
+                         f"in {sum(row['Requests'] for row in stats)} requests to {len(stats)} hosts")
+        for row in stats[:limit]:
+            rate_limit = f"{row['Rate Limit (req/s)']} req/s" if row["Rate Limit (req/s)"] is not None else "none"
+            logging.info(f"Host {row['Host']}: {row['Requests']} requests, {row['Requests/s'] or 0} req/s, "
+                         f"{row['Bytes'] / 1024:.1f} KB, "
+                         f"{row['Throttled']} throttled, average latency {row['Average Latency (s)'] or 0}s, "
+                         f"concurrency limit {row['Concurrency Limit']}, rate limit {rate_limit}")
+        if len(stats) > limit:
+            logging.info(f"... and {len(stats) - limit} more hosts with "
+                         f"{sum(row['Requests'] for row in stats[limit:])} requests")
@@ -0,0 +1,140 @@
+import os
+import gzip
+import json
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Cassette modes
+RECORD = "record"
+REPLAY = "replay"
+
+# Request headers that change the response and are part of the recorded key
+KEY_HEADERS = ["If-None-Match", "If-Modified-Since", "Range"]
+
+# Response headers kept in the cassette; bodies are never recorded
+KEPT_HEADERS = ["Location", "ETag", "Last-Modified", "Content-Type", "Content-Length", "Content-Range", "Retry-After"]
+
+# Recorded exceptions re-raised on replay
+REPLAYED_ERRORS = {
+    "Timeout": requests.exceptions.Timeout,
+    "ConnectionError": requests.exceptions.ConnectionError,
+    "RequestException": requests.exceptions.RequestException,
+}
+
+# Key of a request in the cassette
+def request_key(request):
+    conditional = [f"{name}={request.headers[name]}" for name in KEY_HEADERS if name in request.headers]
+    return " ".join([request.method, request.url] + conditional)
+
+class Cassette:
+    """
+    Request/response metadata recorded from live traffic and replayed without a network.
+
+    Each request is stored under its method, URL and conditional headers with the response
+    status, a few headers, the time to the response and its URL, or the error it raised. Redirect
+    hops are recorded one by one, so a replayed session follows the same redirect chain. Repeated
+    requests replay their recordings in order and then keep returning the last one.
+
+    Args:
+        path (str): Cassette file (gzip-compressed JSON).
+        mode (str): RECORD or REPLAY.
+        replay_latency (bool): Sleep for each recorded response time when replaying.
+    """
+
+    def __init__(self, path, mode=REPLAY, replay_latency=False):
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.lock = threading.Lock()
+        self.interactions = {}
+        self.replayed = {}
+        if mode == REPLAY:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self.interactions = json.load(f)
+            logging.info(f"Replaying {sum(map(len, self.interactions.values()))} recorded requests from {path}")
+
+    # Record the outcome of a live request that took `elapsed` seconds
+    def record(self, request, elapsed, response=None, error=None):
+        if response is not None:
+            interaction = {
+                "status": response.status_code,
+                "reason": response.reason,
+                "url": response.url,
+                "headers": {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+                "elapsed": round(elapsed, 4),
+            }
+        else:
+            interaction = {"error": type(error).__name__, "message": str(error), "elapsed": round(elapsed, 4)}
+            for name, error_type in REPLAYED_ERRORS.items():
+                if isinstance(error, error_type):
+                    interaction["error"] = name
+                    break
+        with self.lock:
+            self.interactions.setdefault(request_key(request), []).append(interaction)
+
+    # Next recorded interaction for a request
+    def next_interaction(self, request):
+        key = request_key(request)
+        with self.lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                raise requests.exceptions.ConnectionError(f"No recorded response for {key}", request=request)
+            index = self.replayed.get(key, 0)
+            self.replayed[key] = index + 1
+        return recorded[min(index, len(recorded) - 1)]
+
+    # Write the recorded interactions
+    def save(self):
+        if self.mode != RECORD:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            data = json.dumps(self.interactions, sort_keys=True, separators=(",", ":"))
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(data)
+        logging.info(f"Recorded {sum(map(len, self.interactions.values()))} requests to {self.path}")
+
+class CassetteAdapter(HTTPAdapter):
+    """HTTPAdapter that records live responses into a cassette, or answers requests from it."""
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == REPLAY:
+            return self.replay(request)
+        # Timed here: Session.send only sets response.elapsed after the adapter returns
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.cassette.record(request, time.perf_counter() - start, error=e)
+            raise
+        self.cassette.record(request, time.perf_counter() - start, response=response)
+        return response
+
+    # Build a Response from the recorded metadata
+    def replay(self, request):
+        interaction = self.cassette.next_interaction(request)
+        if self.cassette.replay_latency:
+            time.sleep(interaction["elapsed"])
+        if "error" in interaction:
+            error_type = REPLAYED_ERRORS.get(interaction["error"], requests.exceptions.RequestException)
+            raise error_type(interaction["message"], request=request)
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.url = interaction["url"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.request = request
+        response._content = b""
+        response._content_consumed = True
+        return response
@@ -0,0 +1,151 @@
+import time
+import sqlite3
+import logging
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from retry_policy import RETRY_STATUSES
+
+# Default cache settings
+CACHE_TTL = 6 * 60 * 60  # Seconds a cached status is trusted without revalidation
+CACHE_MAX_ENTRIES = 50000
+TOUCH_BATCH = 500  # Cache hits whose last-used time is written in one transaction
+BUSY_TIMEOUT = 30  # Seconds a write waits for another process holding the database lock
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Normalize a URL so equivalent links share one cache entry
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+class LinkStatusCache:
+    """
+    On-disk cache of link check results, shared across runs.
+
+    Entries store the status code, ETag/Last-Modified validators, redirect target and check time.
+    Entries younger than `ttl` are reused as-is; older ones are revalidated with a conditional
+    request. The least recently used entries are evicted once the cache exceeds `max_entries`.
+
+    The database runs in WAL mode so worker processes sharing one file can read while another
+    writes. A failed write is rolled back and its sqlite3.Error raised to the caller.
+    """
+
+    def __init__(self, path, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self.conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS url_status (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                redirect_target TEXT,
+                checked_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_url_status_last_used ON url_status (last_used)")
+        self.conn.commit()
+        self.touched = {}
+
+    # Return the cached entry for a URL as a dict, or None
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status_code, etag, last_modified, redirect_target, checked_at FROM url_status WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+            if row is None:
+                return None
+            # Hits only update the LRU order in batches, so a lookup is not a write transaction
+            self.touched[normalize_url(url)] = time.time()
+            if len(self.touched) >= TOUCH_BATCH:
+                self.flush_touched()
+        return {
+            "status_code": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "redirect_target": row[3],
+            "checked_at": row[4],
+        }
+
+    # Check whether an entry can be reused without contacting the server
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry["checked_at"] < self.ttl
+
+    # Build If-None-Match / If-Modified-Since headers for revalidating an entry
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # Mark an entry as revalidated after a 304 Not Modified response
+    def refresh(self, url):
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE url_status SET checked_at = ?, last_used = ? WHERE url = ?", (now, now, normalize_url(url))
+            )
+
+    # Write the last-used times of batched cache hits; call with the lock held
+    def flush_touched(self):
+        if self.touched:
+            touched, self.touched = self.touched, {}
+            try:
+                with self.conn:
+                    self.conn.executemany("UPDATE url_status SET last_used = ? WHERE url = ?",
+                                          [(used, url) for url, used in touched.items()])
+            except sqlite3.Error as e:
+                # A lost batch only makes the eviction order less exact, so the lookup still succeeds
+                logging.warning(f"URL status cache could not record last-used times: {e}")
+
+    # Store the result of a full response; throttled and server-error answers are transient and not cached
+    def store(self, url, response):
+        if response.status_code in RETRY_STATUSES:
+            return
+        now = time.time()
+        redirect_target = response.url if response.history else None
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO url_status VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), response.status_code, response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), redirect_target, now, now)
+            )
+
+    # Evict the least recently used entries beyond max_entries
+    def evict(self):
+        with self.lock:
+            self.flush_touched()
+            count = self.conn.execute("SELECT COUNT(*) FROM url_status").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                with self.conn:
+                    self.conn.execute(
+                        "DELETE FROM url_status WHERE url IN (SELECT url FROM url_status ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                logging.info(f"Evicted {excess} entries from the URL status cache.")
+
+    # Evict and close; a database error only skips the eviction
+    def close(self):
+        try:
+            self.evict()
+        except sqlite3.Error as e:
+            logging.warning(f"URL status cache eviction failed: {e}")
+        with self.lock:
+            self.conn.close()
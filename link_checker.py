@@ -0,0 +1,212 @@
+import time
+import sqlite3
+import logging
+import contextvars
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from tracing import span
+from host_scheduler import HostScheduler
+from retry_policy import RetryPolicy
+
+# Default limits for concurrent link checking
+MAX_WORKERS = 16
+PER_HOST_LIMIT = 4
+REQUEST_TIMEOUT = 5
+LINK_CHECK_DEADLINE = 120  # Seconds a page's link check may take; one slow host cannot stall the run
+
+# Probe modes: "head" asks for headers only, "get" downloads every linked body
+PROBE_HEAD = "head"
+PROBE_GET = "get"
+PROBE_MODE = PROBE_HEAD
+
+# HEAD answers confirmed with a GET: servers that reject or mishandle HEAD, and 404s, which fail the test
+HEAD_FALLBACK_STATUSES = (400, 403, 404, 405, 501)
+
+# Build a result row in the url_status_results.xlsx schema
+def link_row(link, status, status_code="", error_message=""):
+    return {
+        "URL": link,
+        "Status": status,
+        "HTTP Status Code": status_code if status_code else "N/A",
+        "Error Message": error_message if error_message else "None",
+        "Retries": 0
+    }
+
+# Build the result row for an HTTP status code
+def status_row(link, status_code):
+    if status_code == 404:
+        return link_row(link, "Fail", status_code, "404 Not Found")
+    return link_row(link, "pass", status_code)
+
+# Bytes received for a response and its redirect hops: status lines, headers and body bytes read off the socket
+def transferred_bytes(response):
+    total = 0
+    for hop in response.history + [response]:
+        total += len(f"HTTP/1.1 {hop.status_code} {hop.reason}\r\n\r\n")
+        total += sum(len(name) + len(value) + 4 for name, value in hop.headers.items())
+        # Replayed and stubbed responses have no socket to count
+        if hasattr(hop.raw, "tell"):
+            total += hop.raw.tell()
+    return total
+
+# Request a link's status: HEAD first, then a streamed GET closed as soon as its headers arrive
+def request_status(session, link, timeout, headers, probe_mode=PROBE_MODE):
+    if probe_mode == PROBE_GET:
+        response = session.get(link, timeout=timeout, verify=False, headers=headers)
+        return response, transferred_bytes(response)
+
+    response = session.head(link, timeout=timeout, verify=False, headers=headers, allow_redirects=True)
+    transferred = transferred_bytes(response)
+    if response.status_code in HEAD_FALLBACK_STATUSES:
+        with session.get(link, timeout=timeout, verify=False, headers=headers, stream=True) as response:
+            transferred += transferred_bytes(response)
+    return response, transferred
+
+# Check a single link and return its result row
+def check_link(session, link, timeout=REQUEST_TIMEOUT, cache=None, probe_mode=PROBE_MODE):
+    return probe_link(session, link, timeout=timeout, cache=cache, probe_mode=probe_mode)[0]
+
+# Run a link cache operation; a database error is only logged, and None returned so the live result is used
+def cache_call(action, operation, link, *args):
+    try:
+        return operation(link, *args)
+    except sqlite3.Error as e:
+        logging.warning(f"URL status cache {action} failed for {link}: {e}")
+        return None
+
+# Request a link once: (result row, response or None, raised exception or None, bytes received)
+def probe_link(session, link, timeout=REQUEST_TIMEOUT, cache=None, probe_mode=PROBE_MODE, retry=False):
+    status_code = ""
+    response = error = None
+    transferred = 0
+    # A retry must reach the server; the cache is only updated with its answer
+    entry = cache_call("lookup", cache.get, link) if cache and not retry else None
+    if cache and cache.is_fresh(entry):
+        row = status_row(link, entry["status_code"])
+        logging.info(f"Cached URL: {link}, Status: {row['Status']}, HTTP Code: {entry['status_code']}")
+        return row, None, None, 0
+
+    try:
+        headers = cache.conditional_headers(entry) if cache else {}
+        with span("link probe", "http", url=link, method=probe_mode):
+            response, transferred = request_status(session, link, timeout, headers, probe_mode)
+        status_code = response.status_code
+        if status_code == 304 and entry:
+            # Not modified since the last check, so the cached status still holds
+            status_code = entry["status_code"]
+            cache_call("refresh", cache.refresh, link)
+        elif cache:
+            cache_call("store", cache.store, link, response)
+        row = status_row(link, status_code)
+    except requests.exceptions.Timeout as e:
+        row = link_row(link, "Fail", error_message="Timeout")
+        error = e
+    except requests.exceptions.RequestException as e:
+        row = link_row(link, "Fail", error_message=f"Error: {e}")
+        error = e
+
+    logging.info(f"Checked URL: {link}, Status: {row['Status']}, HTTP Code: {status_code}, Error: {row['Error Message']}")
+    return row, response, error, transferred
+
+# Check links concurrently with a global limit, adaptive per-host limits and an overall deadline
+def check_links(session, links, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT,
+                deadline=None, timeout=REQUEST_TIMEOUT, cache=None, scheduler=None, retry_policy=None,
+                probe_mode=PROBE_MODE):
+    """
+    Check every link in parallel and return result rows in the order of `links`.
+
+    Args:
+        session (requests.Session): Session used for every request.
+        links (list): URLs to check.
+        max_workers (int): Maximum number of requests in flight overall.
+        per_host_limit (int): Maximum number of requests in flight per host.
+        deadline (float): Seconds allowed for the whole run; None means no limit.
+        timeout (float): Per-request timeout in seconds.
+        cache (LinkStatusCache): Optional cross-run cache used to skip or revalidate checks.
+        scheduler (HostScheduler): Per-host rate and concurrency control shared with other pages;
+            None uses a scheduler for these links only and logs its per-host throughput.
+        retry_policy (RetryPolicy): Retry deadline, per-link time budget and retry budget shared
+            with other pages; None uses a policy for these links only and logs its retries.
+        probe_mode (str): PROBE_HEAD to read only status and headers, PROBE_GET to download bodies.
+
+    Returns:
+        list: One result row per link with the retries it used. Links not checked before the
+            deadline are marked as failed.
+    """
+    if not links:
+        return []
+
+    end_time = time.monotonic() + deadline if deadline is not None else None
+    own_scheduler = scheduler is None
+    if own_scheduler:
+        scheduler = HostScheduler(per_host_limit)
+    scheduler.attach(session)
+    own_policy = retry_policy is None
+    if own_policy:
+        retry_policy = RetryPolicy()
+
+    def remaining():
+        return None if end_time is None else end_time - time.monotonic()
+
+    def worker(link):
+        retry_policy.budget.record_request()
+        link_start = None
+        row = link_row(link, "Fail", error_message="Deadline exceeded")
+        retries = 0
+        while True:
+            # A link that runs out of time keeps the row of its last attempt, or "Deadline exceeded"
+            if not scheduler.acquire(link, timeout=remaining()):
+                break
+            try:
+                # The link's retry budget starts once it is admitted, not while it waits for its host
+                if link_start is None:
+                    link_start = time.monotonic()
+                attempt_timeout = timeout if retries == 0 else retry_policy.attempt_timeout(timeout, link_start)
+                time_left = remaining()
+                if time_left is not None:
+                    attempt_timeout = min(attempt_timeout, time_left)
+                if attempt_timeout <= 0:
+                    break
+                row, response, error, transferred = probe_link(session, link, timeout=attempt_timeout, cache=cache,
+                                                               probe_mode=probe_mode, retry=retries > 0)
+            finally:
+                scheduler.release(link)
+            scheduler.record_transfer(link, transferred)
+            if isinstance(error, requests.exceptions.Timeout):
+                scheduler.observe_timeout(link)
+
+            status_code = response.status_code if response is not None else None
+            delay = retry_policy.retry_delay(retries, link_start, status_code, error, response)
+            time_left = remaining()
+            if delay is None or (time_left is not None and delay >= time_left):
+                break
+            retries += 1
+            logging.info(f"Retrying URL: {link} in {delay:.1f}s (retry {retries})")
+            time.sleep(delay)
+        return dict(row, Retries=retries)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # Each probe runs in a copy of the caller's context so its spans stay attributed to the test
+        futures = [executor.submit(contextvars.copy_context().run, worker, link) for link in links]
+        wait(futures, timeout=remaining())
+    finally:
+        # Do not block on requests still running past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    rows = []
+    for link, future in zip(links, futures):
+        if future.done() and not future.cancelled():
+            if future.exception():
+                rows.append(link_row(link, "Fail", error_message=f"Error: {future.exception()}"))
+            else:
+                rows.append(future.result())
+        else:
+            logging.warning(f"Deadline exceeded before checking URL: {link}")
+            rows.append(link_row(link, "Fail", error_message="Deadline exceeded"))
+    if own_scheduler:
+        scheduler.log_report()
+    if own_policy:
+        retry_policy.log_report()
+    return rows
@@ -0,0 +1,69 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+
+from tracing import span
+
+# Load profiles: "full" downloads everything, "light" skips what markup-only checks never look at
+FULL_PROFILE = "full"
+LIGHT_PROFILE = "light"
+
+# URL patterns per resource type blocked by the light profile
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.m3u8"],
+}
+LIGHT_BLOCKED_TYPES = ["image", "font", "media"]
+
+# Third-party domains blocked by the light profile: analytics, ads, maps and embedded video
+LIGHT_BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "maps.googleapis.com",
+    "maps.gstatic.com",
+    "youtube.com",
+    "ytimg.com",
+]
+
+# URL patterns blocked for a set of resource types and domains
+def blocked_url_patterns(resource_types=LIGHT_BLOCKED_TYPES, domains=LIGHT_BLOCKED_DOMAINS):
+    patterns = []
+    for resource_type in resource_types:
+        for pattern in RESOURCE_TYPE_PATTERNS[resource_type]:
+            # CDN URLs often carry a query string (photo.jpg?w=800), which "*.jpg" alone would not match
+            patterns += [pattern, f"{pattern}?*"]
+    patterns += [f"*{domain}/*" for domain in domains]
+    return patterns
+
+# Blocked URL patterns of each profile
+LOAD_PROFILES = {
+    FULL_PROFILE: [],
+    LIGHT_PROFILE: blocked_url_patterns(),
+}
+
+# Block the profile's URL patterns for every following page load in this browser
+def apply_load_profile(driver, profile=FULL_PROFILE):
+    """
+    Switch the browser to a load profile through DevTools.
+
+    Requests matching the profile's patterns fail with net::ERR_BLOCKED_BY_CLIENT before they
+    leave the browser. Browsers without DevTools support load every resource.
+
+    Args:
+        driver (webdriver): Chrome WebDriver instance.
+        profile (str): FULL_PROFILE or LIGHT_PROFILE.
+    """
+    try:
+        with span("apply load profile", "page", profile=profile):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LOAD_PROFILES[profile]})
+    except (WebDriverException, AttributeError) as e:
+        logging.warning(f"Could not apply the {profile} load profile, loading every resource: {e}")
+
+# Profile a page load needs so that every given check gets the resources it uses
+def profile_for(profiles):
+    profiles = list(profiles)
+    return LIGHT_PROFILE if profiles and all(profile == LIGHT_PROFILE for profile in profiles) else FULL_PROFILE
@@ -0,0 +1,76 @@
+import json
+import logging
+from selenium.common.exceptions import WebDriverException
+
+from link_cache import normalize_url
+from tracing import span
+
+# Chrome capability that records DevTools network events in the "performance" log
+LOGGING_PREFS = {"performance": "ALL"}
+PERF_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+
+# Read and clear the browser's performance log; empty when the driver does not record one
+def drain_performance_log(driver):
+    try:
+        return driver.get_log("performance")
+    except (WebDriverException, AttributeError):
+        return []
+
+# Forget network events recorded so far, e.g. before navigating to the next page
+def clear_network_log(driver):
+    drain_performance_log(driver)
+
+# Final outcome of every request in DevTools network events: {normalized url: details}
+def parse_network_events(entries):
+    """
+    Follow each request through its redirects to the final response.
+
+    Every URL along a redirect chain gets the final status, matching what `requests` reports
+    when it follows redirects.
+
+    Args:
+        entries (list): Entries from driver.get_log("performance").
+
+    Returns:
+        dict: Normalized URL -> {"URL", "Status Code", "Error", "Resource Type"}. "Status Code"
+        is None for requests that failed without a response.
+    """
+    chains = {}  # requestId -> URLs requested so far, original first
+    outcomes = {}  # requestId -> (status code, error, resource type)
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+
+        if method == "Network.requestWillBeSent":
+            chains.setdefault(request_id, []).append(params["request"]["url"])
+        elif method == "Network.responseReceived":
+            response = params["response"]
+            outcomes[request_id] = (response.get("status"), "", params.get("type", ""))
+        elif method == "Network.loadingFailed" and request_id not in outcomes:
+            outcomes[request_id] = (None, params.get("errorText", ""), params.get("type", ""))
+
+    statuses = {}
+    for request_id, (status_code, error, resource_type) in outcomes.items():
+        for url in chains.get(request_id, []):
+            if not url.startswith("http"):
+                continue
+            statuses[normalize_url(url)] = {
+                "URL": url,
+                "Status Code": int(status_code) if status_code else None,
+                "Error": error,
+                "Resource Type": resource_type,
+            }
+    return statuses
+
+# Status codes of every request the browser made since the log was last read
+def read_network_statuses(driver):
+    with span("read network log", "dom"):
+        statuses = parse_network_events(drain_performance_log(driver))
+    logging.info(f"Browser network log has {len(statuses)} requests.")
+    return statuses
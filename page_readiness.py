@@ -0,0 +1,110 @@
+import time
+import logging
+
+from tracing import span
+from network_log import clear_network_log
+from load_profile import apply_load_profile
+
+# Default readiness settings
+READY_TIMEOUT = 20  # Seconds before giving up and using the page as it is
+NETWORK_IDLE = 0.5  # Seconds without a newly finished resource request
+DOM_QUIET = 0.5  # Seconds without elements added or removed
+DOM_QUIET_MAX_WAIT = 2.0  # Seconds a page that is otherwise ready may wait for DOM quiet; sliders never settle
+POLL_INTERVAL = 0.1
+
+# Installs a MutationObserver once per document and reports every readiness signal in one call
+# Only added and removed nodes count: sliders, countdowns and rotating banners change attributes and text forever
+READINESS_SCRIPT = """
+var selector = arguments[0];
+if (!window.__readinessObserver) {
+    window.__lastMutation = performance.now();
+    window.__readinessObserver = new MutationObserver(function () {
+        window.__lastMutation = performance.now();
+    });
+    window.__readinessObserver.observe(document, {
+        childList: true, subtree: true
+    });
+}
+return {
+    readyState: document.readyState,
+    resources: performance.getEntriesByType("resource").length,
+    sinceMutation: (performance.now() - window.__lastMutation) / 1000,
+    selectorFound: selector ? document.querySelector(selector) !== null : true
+};
+"""
+
+# Wait until the page is usable and return the number of seconds waited
+def wait_for_page_ready(driver, timeout=READY_TIMEOUT, selector=None, network_idle=NETWORK_IDLE,
+                        dom_quiet=DOM_QUIET, dom_quiet_max_wait=DOM_QUIET_MAX_WAIT, poll_interval=POLL_INTERVAL):
+    """
+    Wait for the loaded page to settle instead of sleeping a fixed time.
+
+    The page is ready once document.readyState is "complete", no resource request has finished
+    for `network_idle` seconds, no element has been added or removed for `dom_quiet` seconds and,
+    when given, `selector` matches an element. DOM quiet is best effort: once the other signals
+    hold, the page waits at most `dom_quiet_max_wait` seconds more for it.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance with the page loaded.
+        timeout (float): Maximum number of seconds to wait.
+        selector (str): Optional CSS selector that must be present.
+        network_idle (float): Seconds without newly finished requests.
+        dom_quiet (float): Seconds without elements added or removed.
+        dom_quiet_max_wait (float): Longest wait for DOM quiet once every other signal holds.
+        poll_interval (float): Seconds between checks.
+
+    Returns:
+        float: Seconds waited. The page is used as it is when the timeout is reached.
+    """
+    with span("readiness wait", "page"):
+        return _wait_for_signals(driver, timeout, selector, network_idle, dom_quiet, dom_quiet_max_wait,
+                                 poll_interval)
+
+# Poll the readiness signals until they are all satisfied or the timeout is reached
+def _wait_for_signals(driver, timeout, selector, network_idle, dom_quiet, dom_quiet_max_wait, poll_interval):
+    start = time.monotonic()
+    last_resources = None
+    resources_changed_at = start
+    loaded_at = None  # When every signal but DOM quiet first held
+
+    while True:
+        now = time.monotonic()
+        signals = driver.execute_script(READINESS_SCRIPT, selector)
+        if signals["resources"] != last_resources:
+            last_resources = signals["resources"]
+            resources_changed_at = now
+
+        loaded = (signals["readyState"] == "complete"
+                  and now - resources_changed_at >= network_idle
+                  and signals["selectorFound"])
+        if not loaded:
+            loaded_at = None
+        elif loaded_at is None:
+            loaded_at = now
+
+        if loaded and (signals["sinceMutation"] >= dom_quiet or now - loaded_at >= dom_quiet_max_wait):
+            waited = time.monotonic() - start
+            if signals["sinceMutation"] >= dom_quiet:
+                logging.info(f"Page ready after {waited:.2f}s.")
+            else:
+                logging.info(f"Page ready after {waited:.2f}s (DOM still changing).")
+            return waited
+
+        if now - start >= timeout:
+            waited = time.monotonic() - start
+            logging.warning(f"Page not ready after {waited:.2f}s (readyState: {signals['readyState']}, "
+                            f"selector found: {signals['selectorFound']}). Continuing.")
+            return waited
+
+        time.sleep(poll_interval)
+
+# Navigate to a URL and wait until the page is usable; returns the seconds spent waiting
+def open_page(driver, url, profile=None, **kwargs):
+    # Switch the load profile first when asked; otherwise the browser keeps its current one
+    if profile is not None:
+        apply_load_profile(driver, profile)
+    # The network log then holds only this page load's requests
+    clear_network_log(driver)
+    with span("driver.get", "page", url=url):
+        driver.get(url)
+    return wait_for_page_ready(driver, **kwargs)
@@ -0,0 +1,284 @@
+import os
+import time
+import queue
+import logging
+import argparse
+import threading
+from dataclasses import dataclass, field
+
+from batch_crawl import ensure_directory, read_url_list, read_sitemap, AggregatedReport
+from browser_pool import BrowserPool
+from check_registry import load_checks, run_checks, timed_check, page_load_profile
+from link_cache import LinkStatusCache
+from link_checker import PER_HOST_LIMIT, LINK_CHECK_DEADLINE
+from host_scheduler import HostScheduler
+from retry_policy import RetryPolicy
+from network_log import read_network_statuses
+from page_readiness import open_page
+from static_dom_checks import (parse_page, check_all_h1_tags_in_tree, check_html_sequence_in_tree,
+                               extract_image_attributes, scrape_script_data_from_tree)
+from H1_Tag_Existence_Test import build_h1_tag_frames
+from HTML_Tag_Sequence_Test import build_html_sequence_frames
+from Image_Alt_Attribute_Test import build_image_alt_frames
+from Scrape_Data_from_Script_Tag import build_script_data_frames
+from URL_Status_Code_Test import collect_page_links, check_page_links, build_url_status_frames
+from snapshot_store import SnapshotStore, capture_snapshot
+from http_cassette import Cassette, RECORD, REPLAY
+from tracing import span, stream_trace, export_chrome_trace
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Default pipeline settings
+QUEUE_SIZE = 2  # Pages waiting between two stages; a full queue makes the upstream stage wait
+BROWSERS = 1
+ANALYSIS_WORKERS = 2
+PROBE_WORKERS = 2
+
+# Checks answered from the captured HTML by the analysis stage
+DOM_ANALYSIS_CHECKS = {
+    "H1_Tag_Existence_Test": lambda url, tree: build_h1_tag_frames(url, *check_all_h1_tags_in_tree(tree)),
+    "HTML_Tag_Sequence_Test": lambda url, tree: build_html_sequence_frames(url, *check_html_sequence_in_tree(tree)),
+    "Image_Alt_Attribute_Test": lambda url, tree: build_image_alt_frames(url, extract_image_attributes(tree, url)),
+    "Scrape_Data_from_Script_Tag": lambda url, tree: build_script_data_frames(url, *scrape_script_data_from_tree(tree)),
+}
+LINK_CHECK = "URL_Status_Code_Test"
+
+@dataclass
+class PageWork:
+    """One page travelling through the pipeline; large fields are dropped once used."""
+    url: str
+    index: int = 0  # Position in the URL list, which the reports keep
+    html: str = None
+    links: list = None
+    browser_statuses: dict = None
+    results: list = field(default_factory=list)
+
+class Stage:
+    """
+    A pipeline stage: worker threads taking items from a bounded inbox and passing them on.
+
+    A None item marks the end of the input. Each worker hands it to its siblings, and the last
+    worker to finish passes it downstream.
+    """
+
+    def __init__(self, name, process, inbox, outbox, workers=1):
+        self.name = name
+        self.process = process
+        self.inbox = inbox
+        self.outbox = outbox
+        self.workers = workers
+        self.running = workers
+        self.lock = threading.Lock()
+        self.busy = 0.0
+        self.threads = [threading.Thread(target=self.work, name=f"{name}-{index}", daemon=True)
+                        for index in range(workers)]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+    def work(self):
+        for item in iter(self.inbox.get, None):
+            start = time.perf_counter()
+            try:
+                with span(f"{self.name} stage", "pipeline", url=item.url):
+                    self.process(item)
+            except Exception as e:
+                logging.error(f"{self.name} stage failed for {item.url}: {e}")
+            with self.lock:
+                self.busy += time.perf_counter() - start
+            if self.outbox is not None:
+                self.outbox.put(item)
+
+        self.inbox.put(None)
+        with self.lock:
+            self.running -= 1
+            last = self.running == 0
+        if last and self.outbox is not None:
+            self.outbox.put(None)
+
+# Run pages through navigation, DOM analysis, link probing and report writing at the same time
+def pipeline_crawl(urls, output_dir, browsers=BROWSERS, use_cache=True, checks=None, queue_size=QUEUE_SIZE,
+                   analysis_workers=ANALYSIS_WORKERS, probe_workers=PROBE_WORKERS, snapshot_dir=None, cassette=None,
+                   link_deadline=None, link_check_deadline=LINK_CHECK_DEADLINE):
+    """
+    Check many pages with overlapping stages connected by bounded queues.
+
+    While page N is analysed and its links are probed, the browser already loads page N+1. Every
+    queue holds at most `queue_size` pages, so a slow stage holds back the stages before it
+    instead of letting captured pages pile up in memory. The report stage spools each finished
+    page's rows to disk, so no page's results are held until the end of the run.
+
+    Args:
+        urls (list): Page URLs to check.
+        output_dir (str): Directory for the aggregated result files.
+        browsers (int): Browsers loading pages in parallel.
+        use_cache (bool): Reuse link statuses from the URL status cache.
+        checks (list): Check names to run; None runs every registered check.
+        queue_size (int): Capacity of each queue between stages.
+        analysis_workers (int): Threads analysing captured HTML.
+        probe_workers (int): Pages whose links are probed at the same time.
+        snapshot_dir (str): Snapshot store receiving every page's rendered DOM; None records nothing.
+        cassette (Cassette): HTTP cassette the link probes are recorded into or replayed from.
+        link_deadline (float): Seconds after which failing links are no longer retried; None means no limit.
+        link_check_deadline (float): Seconds each page's link probing may take.
+    """
+    ensure_directory(output_dir)
+    selected = list(load_checks()) if checks is None else list(checks)
+    analysis_checks = [name for name in selected if name in DOM_ANALYSIS_CHECKS]
+    browser_checks = [name for name in selected if name not in DOM_ANALYSIS_CHECKS and name != LINK_CHECK]
+    profile = page_load_profile(selected)
+
+    pool = BrowserPool(size=browsers)
+    # A cassette fixes the link responses, so the cross-run cache would only hide them
+    cache = LinkStatusCache(os.path.join(output_dir, "url_status_cache.db")) if use_cache and not cassette else None
+    snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+    # One scheduler for every probe worker, so pages probed together share each host's limits
+    scheduler = HostScheduler(PER_HOST_LIMIT)
+    retry_policy = RetryPolicy(deadline=link_deadline)
+    report = AggregatedReport(output_dir)
+    # Pages finished ahead of an earlier page wait here, so the reports keep the URL order
+    waiting = {}
+    reported = 0
+
+    # Stage 1: load the page, capture what the other stages need, and run the checks that need the live page
+    def capture(item):
+        with pool.browser() as driver:
+            open_page(driver, item.url, profile=profile)
+            if snapshots:
+                snapshot = capture_snapshot(driver)
+                snapshots.save(item.url, snapshot)
+                item.html = snapshot["page_source"]
+            else:
+                item.html = driver.page_source
+            if LINK_CHECK in selected:
+                item.links = collect_page_links(driver)
+                item.browser_statuses = read_network_statuses(driver)
+            if browser_checks:
+                item.results += run_checks({"driver": driver, "url": item.url, "cache": cache}, names=browser_checks)
+
+    # Stage 2: DOM checks on the captured HTML
+    def analyse(item):
+        if item.html is None:
+            return
+        tree = parse_page(item.html)
+        item.html = None
+        for name in analysis_checks:
+            item.results.append(timed_check(name, lambda: DOM_ANALYSIS_CHECKS[name](item.url, tree)))
+
+    # Stage 3: probe the links the browser did not already fetch
+    def probe(item):
+        if item.links is None:
+            return
+        links, statuses = item.links, item.browser_statuses
+        item.links = item.browser_statuses = None
+        item.results.append(timed_check(LINK_CHECK, lambda: build_url_status_frames(
+            item.url, check_page_links(links, cache=cache, browser_statuses=statuses, cassette=cassette,
+                                       scheduler=scheduler, retry_policy=retry_policy,
+                                       deadline=link_check_deadline))))
+
+    # Stage 4: spool the finished page results to the reports, in URL order
+    def collect(item):
+        nonlocal reported
+        waiting[item.index] = item
+        while reported in waiting:
+            page = waiting.pop(reported)
+            report.add_page(page.url, page.results)
+            reported += 1
+            logging.info(f"Finished page {reported}/{len(urls)}: {page.url}")
+
+    url_queue, captured, analysed, probed = (queue.Queue(maxsize=queue_size) for _ in range(4))
+    stages = [
+        Stage("capture", capture, url_queue, captured, workers=browsers),
+        Stage("analysis", analyse, captured, analysed, workers=analysis_workers),
+        Stage("probe", probe, analysed, probed, workers=probe_workers),
+        Stage("report", collect, probed, None),
+    ]
+
+    # Spans go to the trace file as the run proceeds, so memory stays flat however many pages there are
+    trace_file = os.path.join(output_dir, "pipeline_trace.json")
+    stream_trace(trace_file)
+    logging.info(f"Pipelining {len(urls)} pages with {browsers} browsers ({profile} profile).")
+    start = time.perf_counter()
+    try:
+        for stage in stages:
+            stage.start()
+        for index, url in enumerate(urls):
+            url_queue.put(PageWork(url, index))
+        url_queue.put(None)
+        for stage in stages:
+            stage.join()
+    except BaseException:
+        report.close()
+        raise
+    finally:
+        pool.close()
+        if cache:
+            cache.close()
+        if snapshots:
+            snapshots.close()
+        if cassette:
+            cassette.save()
+    elapsed = time.perf_counter() - start
+
+    # Pages stuck behind one that never reached the report stage are still reported
+    for index in sorted(waiting):
+        report.add_page(waiting[index].url, waiting[index].results)
+    with span("report merge", "pipeline"):
+        report.save()
+
+    for stage in stages:
+        utilization = stage.busy / (elapsed * stage.workers) if elapsed else 0
+        logging.info(f"{stage.name} stage: {stage.busy:.1f}s busy, {utilization:.0%} of {stage.workers} worker(s)")
+    scheduler.log_report()
+    retry_policy.log_report()
+    logging.info(f"Checked {reported + len(waiting)} pages in {elapsed:.1f}s.")
+    export_chrome_trace(trace_file)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Run the property page tests across many pages as a staged pipeline.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--url-file", help="File with one page URL per line")
+    source.add_argument("--sitemap", help="Sitemap file or URL listing the pages to check")
+    parser.add_argument("--browsers", type=int, default=BROWSERS, help="Browsers loading pages in parallel")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Pages buffered between two stages")
+    parser.add_argument("--output-dir", default="test_results", help="Directory for the aggregated result files")
+    parser.add_argument("--no-cache", action="store_true", help="Check every link live instead of using the URL status cache")
+    parser.add_argument("--record-snapshots", metavar="DIR", default=None,
+                        help="Save every page's rendered DOM to a snapshot store for snapshot_store.py replays")
+    parser.add_argument("--cassette", default=None, help="HTTP cassette file for the link checker (gzip JSON)")
+    parser.add_argument("--cassette-mode", choices=[RECORD, REPLAY], default=REPLAY,
+                        help="Record live link responses into the cassette, or replay them from it")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="Wait for each recorded response time when replaying")
+    parser.add_argument("--link-deadline", type=float, default=None,
+                        help="Seconds after which failing links are reported instead of retried")
+    parser.add_argument("--link-check-deadline", type=float, default=LINK_CHECK_DEADLINE,
+                        help="Seconds each page's link check may take; links not checked by then are reported as failed")
+    parser.add_argument("--checks", type=lambda value: value.split(","), default=None,
+                        help="Comma-separated check names to run on every page (default: all)")
+    args = parser.parse_args()
+
+    urls = read_url_list(args.url_file) if args.url_file else read_sitemap(args.sitemap)
+    # Drop duplicates while keeping the order
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        logging.warning("No page URLs to check.")
+        return
+
+    pipeline_crawl(urls, args.output_dir, browsers=args.browsers, use_cache=not args.no_cache,
+                   checks=args.checks, queue_size=args.queue_size, snapshot_dir=args.record_snapshots,
+                   cassette=Cassette(args.cassette, args.cassette_mode, args.replay_latency) if args.cassette else None,
+                   link_deadline=args.link_deadline, link_check_deadline=args.link_check_deadline)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info("Execution interrupted by user.")
@@ -1,53 +1,12 @@
 import os
 import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from report_writer import save_with_auto_width
 
 # Ensure directory exists
 def ensure_directory(path):
     if path and not os.path.exists(path):  # Check if the path is not empty
         os.makedirs(path)
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df, sheet_name=None):
-    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-
-    # Format the sheet
-    wb = load_workbook(filepath)
-    ws = wb[sheet_name]
-
-    # Define styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    # Adjust column widths and format headers
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-            cell.alignment = alignment
-            cell.border = border
-        ws.column_dimensions[col_letter].width = max_length + 5  # Adjust column width
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = alignment
-
-    wb.save(filepath)
-
 # Consolidate specified summary files into one report
 def consolidate_summaries(file_list, report_file):
     # Remove the report file if it exists to prevent appending issues
@@ -81,6 +40,7 @@ def main():
         "test_results/h1_tag_summary.xlsx",
         "test_results/html_tag_summary.xlsx",
         "test_results/image_alt_summary.xlsx",
+        "test_results/page_performance_summary.xlsx",
         "test_results/script_data_summary.xlsx",
         "test_results/url_status_summary.xlsx"
     ]
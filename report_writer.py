@@ -0,0 +1,172 @@
+import os
+import pickle
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+
+from tracing import span
+
+# Shared report styles
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill("solid", fgColor="4F81BD")
+ALIGNMENT = Alignment(horizontal="center", vertical="center", wrap_text=True)
+REASON_ALIGNMENT = Alignment(horizontal="left", vertical="center", wrap_text=True)
+BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin")
+)
+WIDTH_PADDING = 5
+REASON_COLUMN = 3  # Column D holds the message in the currency results
+
+# Compute column widths from the DataFrame instead of from cell objects
+def column_widths(df):
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = df.iloc[:, position]
+        # Empty and zero values do not count towards the width, as in the original per-cell loop
+        values = values[values.notna() & values.astype(bool)]
+        longest = values.astype(str).str.len().max() if len(values) else 0
+        widths.append(max(len(str(column)), int(longest)) + WIDTH_PADDING)
+    return widths
+
+# Yield the DataFrame rows as plain Python values with missing values as None
+def frame_rows(df):
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+# Append the rows of a DataFrame to a write-only worksheet with the report styles
+def write_styled_sheet(wb, df, sheet_name, has_reason_column=False, styled=True):
+    return write_styled_rows(wb, sheet_name, list(df.columns), column_widths(df), frame_rows(df),
+                             has_reason_column=has_reason_column, styled=styled)
+
+# Stream a header and rows into a new write-only worksheet with the report styles
+def write_styled_rows(wb, sheet_name, columns, widths, rows, has_reason_column=False, styled=True):
+    ws = wb.create_sheet(title=sheet_name)
+
+    # Column widths must be set before any row is streamed
+    for index, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = width
+
+    # Plain values only when styling is skipped
+    if not styled:
+        ws.append(list(columns))
+        for row in rows:
+            ws.append(list(row))
+        return ws
+
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(ws, value=column)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = ALIGNMENT
+        cell.border = BORDER
+        header.append(cell)
+    ws.append(header)
+
+    for row in rows:
+        cells = []
+        for index, value in enumerate(row):
+            # Format the 'Reason' column with a 'Message:' prefix on its own line
+            if has_reason_column and index == REASON_COLUMN and value:
+                cell = WriteOnlyCell(ws, value=f"Message:\n{value}")
+                cell.alignment = REASON_ALIGNMENT
+            else:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.alignment = ALIGNMENT
+            cell.border = BORDER
+            cells.append(cell)
+        ws.append(cells)
+    return ws
+
+# Save DataFrame to Excel with auto-adjusted column widths and formatting in a single pass
+def save_with_auto_width(filepath, df, sheet_name=None, has_reason_column=False):
+    """
+    Save a DataFrame to an Excel file, auto-adjust column widths, and enhance formatting.
+
+    The workbook is streamed once in openpyxl write-only mode instead of being written,
+    reloaded and restyled cell by cell.
+
+    Args:
+        filepath (str): Path to save the Excel file.
+        df (pd.DataFrame): DataFrame to save.
+        sheet_name (str): Name of the sheet; defaults to "Sheet1" like DataFrame.to_excel.
+        has_reason_column (bool): Prefix the values of column D with "Message:" and left-align them.
+    """
+    with span("excel write", "report", path=filepath, rows=len(df)):
+        wb = Workbook(write_only=True)
+        write_styled_sheet(wb, df, sheet_name or "Sheet1", has_reason_column=has_reason_column)
+        wb.save(filepath)
+
+# Save several DataFrames as sheets of one workbook with a single save
+def save_sheets(filepath, sheets, styled=True):
+    """
+    Save several DataFrames to one Excel file in a single pass.
+
+    Args:
+        filepath (str): Path to save the Excel file.
+        sheets (list): (sheet name, DataFrame) pairs, written in the given order.
+        styled (bool): Apply the report styles; False writes plain values with column widths only.
+    """
+    with span("excel write", "report", path=filepath, sheets=len(sheets)):
+        wb = Workbook(write_only=True)
+        for sheet_name, df in sheets:
+            write_styled_sheet(wb, df, sheet_name, styled=styled)
+        wb.save(filepath)
+
+class SpooledSheet:
+    """
+    Rows of one report sheet, spooled to disk as they arrive and written to Excel in one pass.
+
+    Every appended DataFrame is pickled to the spool file; only the column names and widths stay in
+    memory, so a report covering many pages needs no more memory than one covering a single page.
+    Columns missing from some DataFrames are left empty there, as with pd.concat.
+
+    Args:
+        spool_path (str): File holding the spooled rows until the sheet is saved.
+    """
+
+    def __init__(self, spool_path):
+        self.spool_path = spool_path
+        self.spool = open(spool_path, "wb")
+        self.widths = {}  # Column name -> width, in the order the columns were first seen
+        self.rows = 0
+
+    # Spool the rows of a DataFrame
+    def append(self, df):
+        for column, width in zip(df.columns, column_widths(df)):
+            self.widths[column] = max(self.widths.get(column, 0), width)
+        pickle.dump((list(df.columns), list(frame_rows(df))), self.spool)
+        self.rows += len(df)
+
+    # Read the spooled rows back, aligned to the columns of the whole sheet
+    def spooled_rows(self):
+        columns = list(self.widths)
+        with open(self.spool_path, "rb") as spool:
+            while True:
+                try:
+                    chunk_columns, chunk_rows = pickle.load(spool)
+                except EOFError:
+                    return
+                positions = {column: index for index, column in enumerate(chunk_columns)}
+                for row in chunk_rows:
+                    yield [row[positions[column]] if column in positions else None for column in columns]
+
+    # Write the spooled rows to an Excel file and delete the spool file
+    def save(self, filepath, sheet_name=None, has_reason_column=False):
+        self.close()
+        try:
+            with span("excel write", "report", path=filepath, rows=self.rows):
+                wb = Workbook(write_only=True)
+                write_styled_rows(wb, sheet_name or "Sheet1", list(self.widths), list(self.widths.values()),
+                                  self.spooled_rows(), has_reason_column=has_reason_column)
+                wb.save(filepath)
+        finally:
+            os.remove(self.spool_path)
+
+    # Stop spooling; the spool file stays until save() or its owner removes it
+    def close(self):
+        self.spool.close()
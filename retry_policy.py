@@ -0,0 +1,119 @@
+import time
+import random
+import logging
+import threading
+
+from host_scheduler import retry_after_seconds
+
+# Default retry settings
+MAX_RETRIES = 3  # Retries per link on top of the first attempt
+LINK_BUDGET = 15.0  # Seconds one link may take across all its attempts and backoff
+BASE_DELAY = 0.5  # Backoff ceiling of the first retry; doubled for every further retry
+MAX_DELAY = 8.0
+MIN_ATTEMPT_TIME = 1.0  # A retry that would have less time than this left is not started
+
+# Share of requests that may be retries, plus a few retries allowed regardless
+RETRY_RATIO = 0.2
+MIN_RETRIES = 10
+
+# Responses worth another attempt; the throttling ones may name a wait in Retry-After
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_STATUSES = (429, 503)
+
+class RetryBudget:
+    """
+    Retry allowance shared by every link of a run.
+
+    Retries may add at most `ratio` of the requests made so far, plus `min_retries`. When many
+    requests fail at once the budget runs out and failing links are reported instead of retried,
+    so an outage cannot multiply the traffic or the run time.
+    """
+
+    def __init__(self, ratio=RETRY_RATIO, min_retries=MIN_RETRIES):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+
+    # Count a first attempt
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    # Take one retry from the budget; False when it is used up
+    def try_spend(self):
+        with self.lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                self.denied += 1
+                return False
+            self.retries += 1
+            return True
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed link probe is tried again.
+
+    A retry waits a random time up to an exponentially growing ceiling (full jitter), or the
+    Retry-After a throttling server asked for. It is only started when it still fits in the link's
+    own time budget and before the run deadline, and only while the shared retry budget lasts.
+    The deadline never stops a link's first attempt, and the link budget starts once the first
+    attempt is admitted, not while the link waits for its host.
+    Share one policy between pages so the deadline and the budget cover the whole run.
+
+    Args:
+        deadline (float): Seconds from now after which no link is retried; None means no limit.
+        link_budget (float): Seconds each link may take over all its attempts.
+        max_retries (int): Retries per link.
+        base_delay (float): Backoff ceiling of the first retry in seconds.
+        max_delay (float): Largest backoff in seconds.
+        budget (RetryBudget): Shared retry allowance; a new one when None.
+    """
+
+    def __init__(self, deadline=None, link_budget=LINK_BUDGET, max_retries=MAX_RETRIES, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, budget=None):
+        self.end_time = time.monotonic() + deadline if deadline is not None else None
+        self.link_budget = link_budget
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+
+    # Seconds a link started at `link_start` may still use, bounded by the run deadline
+    def time_left(self, link_start):
+        left = link_start + self.link_budget - time.monotonic()
+        if self.end_time is not None:
+            left = min(left, self.end_time - time.monotonic())
+        return left
+
+    # Timeout of a retry: the request timeout, cut to what is left of the link's budget; <= 0 when nothing is left
+    def attempt_timeout(self, timeout, link_start):
+        return min(timeout, link_start + self.link_budget - time.monotonic())
+
+    # Seconds to wait before retrying a failed attempt, or None when the link is done
+    def retry_delay(self, retries, link_start, status_code=None, error=None, response=None):
+        if retries >= self.max_retries:
+            return None
+        if error is None and status_code not in RETRY_STATUSES:
+            return None
+
+        retry_after = None
+        if response is not None and status_code in RETRY_AFTER_STATUSES:
+            retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retries))
+
+        if delay + MIN_ATTEMPT_TIME > self.time_left(link_start):
+            return None
+        if not self.budget.try_spend():
+            return None
+        return delay
+
+    # Log how many retries the run used
+    def log_report(self):
+        budget = self.budget
+        logging.info(f"Link retries: {budget.retries} for {budget.requests} links, "
+                     f"{budget.denied} refused by the retry budget")
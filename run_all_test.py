@@ -1,9 +1,20 @@
 import os
+import argparse
 import subprocess
 import pandas as pd
 import logging
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+from concurrent.futures import ThreadPoolExecutor
+from report_writer import save_sheets, save_with_auto_width
+from tracing import export_chrome_trace, timing_table
+from check_registry import run_checks, save_check_results, page_load_profile
+from link_cache import LinkStatusCache
+from page_readiness import open_page
+from element_lookup import absent_lookup_totals
+from snapshot_store import SnapshotStore, capture_snapshot
+from http_cassette import Cassette, RECORD, REPLAY
+from retry_policy import RetryPolicy
+from link_checker import LINK_CHECK_DEADLINE
+from driver_factory import init_driver, prewarm_driver
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -13,44 +24,6 @@ def ensure_directory(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
-# Save DataFrame to Excel with auto-adjusted column widths and formatting
-def save_with_auto_width(filepath, df, sheet_name):
-    with pd.ExcelWriter(filepath, engine='openpyxl', mode='a') as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-        wb = writer.book
-        ws = wb[sheet_name]
-
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill("solid", fgColor="4F81BD")
-        alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin")
-        )
-
-        # Adjust column widths and format headers
-        for col in ws.columns:
-            max_length = 0
-            col_letter = col[0].column_letter
-            for cell in col:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except Exception as e:
-                    logging.warning(f"Error calculating column width: {e}")
-                    pass
-                cell.alignment = alignment
-                cell.border = border
-            ws.column_dimensions[col_letter].width = max_length + 5
-
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = alignment
-
 # Run individual test scripts
 def run_tests(test_scripts):
     for script in test_scripts:
@@ -61,67 +34,139 @@ def run_tests(test_scripts):
         except subprocess.CalledProcessError as e:
             logging.error(f"Error running {script_name}: {e}")
 
+# Run every registered check in this interpreter against one shared browser session and a single page load
+def run_suite(url, result_dir, workers=1, use_cache=True, currency_workers=1, checks=None, snapshot_dir=None,
+              cassette=None, link_deadline=None, link_check_deadline=LINK_CHECK_DEADLINE):
+    ensure_directory(result_dir)
+    driver = init_driver()
+    # Extra currency contexts launch their browsers while the other checks run
+    if currency_workers > 1:
+        prewarm_driver(count=currency_workers - 1)
+    # A cassette fixes the link responses, so the cross-run cache would only hide them
+    cache = LinkStatusCache(os.path.join(result_dir, "url_status_cache.db")) if use_cache and not cassette else None
+    try:
+        # Markup-only check selections load the page without images, fonts, media and trackers
+        profile = page_load_profile(checks)
+        logging.info(f"Loading page once for the suite ({profile} profile): {url}")
+        open_page(driver, url, profile=profile)
+        if snapshot_dir:
+            record_snapshot(snapshot_dir, url, driver)
+
+        # Link retries stop once `link_deadline` seconds have passed since the suite started
+        retry_policy = RetryPolicy(deadline=link_deadline)
+        context = {"driver": driver, "url": url, "cache": cache, "cassette": cassette,
+                   "retry_policy": retry_policy, "link_check_deadline": link_check_deadline,
+                   "currency_workers": currency_workers}
+        results = run_checks(context, names=checks, workers=workers)
+        retry_policy.log_report()
+        save_check_results(results, result_dir)
+    finally:
+        if cache:
+            cache.close()
+        if cassette:
+            cassette.save()
+        driver.quit()
+
+    for result in results:
+        logging.info(f"{result.name}: {result.status} ({result.duration:.2f}s) {result.comments}")
+    save_timings(result_dir)
+    return results
+
+# Save the rendered DOM of the loaded page for replaying the markup checks offline
+def record_snapshot(snapshot_dir, url, driver):
+    store = SnapshotStore(snapshot_dir)
+    try:
+        digest = store.save(url, capture_snapshot(driver))
+        logging.info(f"Snapshot {digest[:12]} recorded for {url}")
+    finally:
+        store.close()
+
+# Save the Chrome trace and the per-test timing table next to the summaries
+def save_timings(result_dir):
+    trace_file = os.path.join(result_dir, "suite_trace.json")
+    timing_file = os.path.join(result_dir, "timing_summary.xlsx")
+    table = timing_table()
+    save_with_auto_width(timing_file, table)
+    export_chrome_trace(trace_file)
+    absent_count, absent_seconds = absent_lookup_totals(table)
+    logging.info(f"Element lookups that found nothing: {absent_count} taking {absent_seconds:.2f}s")
+    logging.info(f"Timings saved to {timing_file} and {trace_file}")
+
 # Consolidate all result files ending with "results.xlsx" into one file with separate sheets
-def consolidate_results(result_dir, output_file):
+def consolidate_results(result_dir, output_file, styled=True):
     ensure_directory(result_dir)
-    summary_data = []
-    
-    for file_name in os.listdir(result_dir):
-        if file_name.endswith("results.xlsx"):
-            file_path = os.path.join(result_dir, file_name)
-            sheet_name = file_name.replace("_results.xlsx", "").title()
-
-            # Load individual test results
-            df = pd.read_excel(file_path)
-            summary_data.append((df, sheet_name))
-
-    # Save all sheets to the output file
-    for idx, (df, sheet_name) in enumerate(summary_data):
-        mode = 'w' if idx == 0 else 'a'  # Write mode for first sheet, append for others
-        with pd.ExcelWriter(output_file, engine='openpyxl', mode=mode) as writer:
-            df.to_excel(writer, index=False, sheet_name=sheet_name)
-            wb = writer.book
-            ws = wb[sheet_name]
-
-            # Adjust column widths and format headers
-            for col in ws.columns:
-                max_length = 0
-                col_letter = col[0].column_letter
-                for cell in col:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except Exception as e:
-                        logging.warning(f"Error calculating column width: {e}")
-                        pass
-                    cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-                ws.column_dimensions[col_letter].width = max_length + 5
-
-            for cell in ws[1]:
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill("solid", fgColor="4F81BD")
-                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-    logging.info(f"Consolidated report saved to {output_file}")
+
+    # Sorted so the sheet order does not depend on the file system
+    result_files = sorted(file_name for file_name in os.listdir(result_dir) if file_name.endswith("results.xlsx"))
+    sheet_names = [file_name.replace("_results.xlsx", "").title() for file_name in result_files]
+
+    # Load individual test results concurrently
+    with ThreadPoolExecutor() as executor:
+        frames = list(executor.map(pd.read_excel, [os.path.join(result_dir, name) for name in result_files]))
+
+    # Save all sheets to the output file with a single workbook save
+    if frames:
+        save_sheets(output_file, list(zip(sheet_names, frames)), styled=styled)
+        logging.info(f"Consolidated report saved to {output_file}")
+    else:
+        logging.warning(f"No result files found in {result_dir}. Skipping consolidated report.")
+
+# Parse command line options
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run all property page tests and consolidate the results.")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run each test script in its own Python process with its own browser")
+    parser.add_argument("--url", default="https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/",
+                        help="Page URL tested by the in-process runner")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of checks the in-process runner executes at the same time")
+    parser.add_argument("--currency-workers", type=int, default=1,
+                        help="Number of browser contexts checking currencies in parallel; more than 1 also "
+                             "tests the wider EXTENDED_CURRENCY_LIST")
+    parser.add_argument("--checks", type=lambda value: value.split(","), default=None,
+                        help="Comma-separated check names to run in-process (default: all)")
+    parser.add_argument("--record-snapshots", metavar="DIR", default=None,
+                        help="Save the rendered DOM to a snapshot store for snapshot_store.py replays")
+    parser.add_argument("--cassette", default=None,
+                        help="HTTP cassette file for the link checker (gzip JSON)")
+    parser.add_argument("--cassette-mode", choices=[RECORD, REPLAY], default=REPLAY,
+                        help="Record live link responses into the cassette, or replay them from it")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="Wait for each recorded response time when replaying")
+    parser.add_argument("--link-deadline", type=float, default=None,
+                        help="Seconds after which failing links are reported instead of retried")
+    parser.add_argument("--link-check-deadline", type=float, default=LINK_CHECK_DEADLINE,
+                        help="Seconds each page's link check may take; links not checked by then are reported as failed")
+    parser.add_argument("--no-restyle", action="store_true",
+                        help="Write the consolidated report without restyling every cell")
+    return parser.parse_args()
 
 # Main function
 def main():
+    args = parse_args()
     test_scripts = [
         "Currency_Filtering_Test.py",
         "H1_Tag_Existence_Test.py",
         "HTML_Tag_Sequence_Test.py",
         "Image_Alt_Attribute_Test.py",
+        "Page_Performance_Budget_Test.py",
         "Scrape_Data_from_Script_Tag.py",
         "URL_Status_Code_Test.py",
     ]
     result_dir = "test_results"
     consolidated_report = os.path.join(result_dir, "report_model_details.xlsx")
 
-    # Run all test scripts
-    run_tests(test_scripts)
+    # Run all tests in this interpreter on one shared browser session, or one script at a time
+    if args.subprocess:
+        run_tests(test_scripts)
+    else:
+        cassette = Cassette(args.cassette, args.cassette_mode, args.replay_latency) if args.cassette else None
+        run_suite(args.url, result_dir, workers=args.workers, currency_workers=args.currency_workers,
+                  checks=args.checks, snapshot_dir=args.record_snapshots, cassette=cassette,
+                  link_deadline=args.link_deadline, link_check_deadline=args.link_check_deadline)
 
     # Consolidate results into one Excel file
-    consolidate_results(result_dir, consolidated_report)
+    consolidate_results(result_dir, consolidated_report, styled=not args.no_restyle)
 
 if __name__ == "__main__":
     main()
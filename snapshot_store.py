@@ -0,0 +1,164 @@
+import os
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+
+from dom_extract import (extraction_key, extract_texts, extract_headers, extract_image_attributes,
+                         extract_links)
+from tracing import span
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Checks that can run against a stored snapshot instead of a live page
+REPLAY_CHECKS = [
+    "H1_Tag_Existence_Test",
+    "HTML_Tag_Sequence_Test",
+    "Image_Alt_Attribute_Test",
+    "Scrape_Data_from_Script_Tag",
+]
+
+# Compression level of stored snapshots; higher levels cost more time than they save on HTML
+COMPRESS_LEVEL = 6
+
+# Capture the rendered DOM and the element data the replayable checks extract
+def capture_snapshot(driver):
+    with span("capture snapshot", "dom"):
+        return {
+            "page_source": driver.page_source,
+            "extractions": {
+                extraction_key("texts", "h1"): extract_texts(driver, "h1"),
+                extraction_key("headers"): extract_headers(driver),
+                extraction_key("images"): extract_image_attributes(driver),
+                extraction_key("links"): extract_links(driver),
+            },
+        }
+
+class SnapshotStore:
+    """
+    Compressed, content-addressed store of rendered page snapshots.
+
+    Each snapshot is saved once under the SHA-256 of its content in `objects/`, gzip compressed,
+    so pages that did not change between runs take no extra space. An index records which
+    snapshot every URL had at every capture.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                url TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                captured_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots (url, captured_at)")
+        self.conn.commit()
+
+    # File holding the snapshot with a given digest
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.json.gz")
+
+    # Save a snapshot of a URL and return its digest
+    def save(self, url, snapshot):
+        data = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written to a temp file first so a concurrent reader never sees half a snapshot
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, "wb", compresslevel=COMPRESS_LEVEL) as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        with self.lock:
+            self.conn.execute("INSERT INTO snapshots VALUES (?, ?, ?)", (url, digest, time.time()))
+            self.conn.commit()
+        return digest
+
+    # Load a snapshot by digest
+    def load(self, digest):
+        with gzip.open(self.object_path(digest), "rb") as f:
+            return json.loads(f.read().decode("utf-8"))
+
+    # (url, digest) of the latest snapshot of every URL, in the order the URLs were first captured
+    def latest(self):
+        with self.lock:
+            return self.conn.execute("""
+                SELECT url, digest FROM snapshots AS s
+                WHERE captured_at = (SELECT MAX(captured_at) FROM snapshots WHERE url = s.url)
+                GROUP BY url
+                ORDER BY (SELECT MIN(captured_at) FROM snapshots WHERE url = s.url)
+            """).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class SnapshotDriver:
+    """Stand-in for a WebDriver that answers DOM extractions from a stored snapshot."""
+
+    def __init__(self, url, snapshot):
+        self.current_url = url
+        self.page_source = snapshot["page_source"]
+        self.extractions = snapshot["extractions"]
+
+    # Answer a dom_extract call from the snapshot
+    def replay_extraction(self, name, *args):
+        key = extraction_key(name, *args)
+        if key not in self.extractions:
+            raise LookupError(f"The snapshot of {self.current_url} has no recorded '{key}' extraction.")
+        return self.extractions[key]
+
+    def execute_script(self, script, *args):
+        raise LookupError("Snapshots cannot run scripts; only dom_extract calls can be replayed.")
+
+# Re-run the replayable checks against the latest snapshot of every page
+def replay_snapshots(store_dir, output_dir, checks=None):
+    # Imported here so recording does not load the check modules
+    from batch_crawl import ensure_directory, save_aggregated_results
+    from check_registry import run_checks
+
+    ensure_directory(output_dir)
+    names = [name for name in (checks or REPLAY_CHECKS) if name in REPLAY_CHECKS]
+    store = SnapshotStore(store_dir)
+    start = time.perf_counter()
+    page_results = []
+    try:
+        for url, digest in store.latest():
+            driver = SnapshotDriver(url, store.load(digest))
+            page_results.append((url, run_checks({"driver": driver, "url": url}, names=names)))
+    finally:
+        store.close()
+
+    save_aggregated_results(page_results, output_dir)
+    logging.info(f"Replayed {len(page_results)} snapshots in {time.perf_counter() - start:.2f}s.")
+    return page_results
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Re-run the markup checks against recorded DOM snapshots.")
+    parser.add_argument("--store", default=os.path.join("test_results", "snapshots"),
+                        help="Snapshot store written with --record-snapshots")
+    parser.add_argument("--output-dir", default=os.path.join("test_results", "replay"),
+                        help="Directory for the replayed result files")
+    parser.add_argument("--checks", type=lambda value: value.split(","), default=None,
+                        help=f"Comma-separated checks to replay (default: {','.join(REPLAY_CHECKS)})")
+    args = parser.parse_args()
+
+    replay_snapshots(args.store, args.output_dir, checks=args.checks)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info("Execution interrupted by user.")
@@ -0,0 +1,116 @@
+import os
+import logging
+import argparse
+import requests
+import lxml.html
+from urllib.parse import urljoin
+
+from H1_Tag_Existence_Test import save_h1_tag_results
+from driver_factory import init_driver
+from HTML_Tag_Sequence_Test import evaluate_html_sequence, save_html_sequence_results
+from Image_Alt_Attribute_Test import save_image_alt_results
+from Scrape_Data_from_Script_Tag import extract_script_data, save_script_data_results
+from page_readiness import open_page
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Elements inside these tags are never rendered by a JavaScript-enabled browser
+NOT_RENDERED = "not(ancestor::noscript) and not(ancestor::template)"
+
+# Ensure directory exists
+def ensure_directory(path):
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+# Fetch the raw page HTML over plain HTTP
+def fetch_page_html(url, timeout=10):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+# Capture the rendered DOM with a single Selenium page_source call
+def capture_rendered_html(url):
+    driver = init_driver()
+    try:
+        open_page(driver, url)
+        return driver.page_source
+    finally:
+        driver.quit()
+
+# Parse page HTML into an lxml tree
+def parse_page(html):
+    return lxml.html.fromstring(html)
+
+# Collapse whitespace the way a browser reports element text
+def element_text(element):
+    return " ".join(element.text_content().split())
+
+# Test: Check All H1 Tags in a parsed page
+def check_all_h1_tags_in_tree(tree):
+    h1_tags = tree.xpath(f"//h1[{NOT_RENDERED}]")
+    if h1_tags:
+        h1_texts = [element_text(h1) for h1 in h1_tags if element_text(h1)]
+        logging.info(f"Found {len(h1_texts)} H1 tags on the page.")
+        return "Pass", "H1 tags found.", h1_texts
+    logging.warning("No H1 tags found on the page.")
+    return "Fail", "No H1 tags found.", []
+
+# Test: Check HTML Tag Sequence in a parsed page
+def check_html_sequence_in_tree(tree):
+    headers = tree.xpath(" | ".join(f"//h{level}[{NOT_RENDERED}]" for level in range(1, 7)))
+    return evaluate_html_sequence([(header.tag, element_text(header)) for header in headers])
+
+# Collect (src, alt) pairs for every image, resolving sources like the browser does
+def extract_image_attributes(tree, base_url):
+    image_attributes = []
+    for img in tree.xpath(f"//img[{NOT_RENDERED}]"):
+        img_src = img.get("src")
+        image_attributes.append((urljoin(base_url, img_src) if img_src else img_src, img.get("alt")))
+    return image_attributes
+
+# Scrape data from the <script> tags of a parsed page, by the same rule as scrape_script_data
+def scrape_script_data_from_tree(tree):
+    return extract_script_data()
+
+# Run the read-only checks against a single snapshot of the page
+def run_static_checks(url, output_dir, render=False):
+    ensure_directory(output_dir)
+
+    logging.info(f"Capturing {'rendered' if render else 'static'} HTML for URL: {url}")
+    html = capture_rendered_html(url) if render else fetch_page_html(url)
+    tree = parse_page(html)
+
+    result, comment, h1_texts = check_all_h1_tags_in_tree(tree)
+    save_h1_tag_results(url, result, comment, h1_texts, output_dir)
+
+    result, comment, header_info, levels = check_html_sequence_in_tree(tree)
+    save_html_sequence_results(url, result, comment, header_info, levels, output_dir)
+
+    save_image_alt_results(
+        url,
+        extract_image_attributes(tree, url),
+        os.path.join(output_dir, "image_alt_results.xlsx"),
+        os.path.join(output_dir, "image_alt_summary.xlsx"),
+    )
+
+    result, data = scrape_script_data_from_tree(tree)
+    save_script_data_results(url, result, data, output_dir)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Run the read-only page checks without a browser per check.")
+    parser.add_argument("--url", default="https://www.alojamiento.io/property/mall-of-i-stanbul-3/BC-6975002/",
+                        help="Page URL to check")
+    parser.add_argument("--render", action="store_true",
+                        help="Capture the JavaScript-rendered DOM from one Selenium page_source")
+    parser.add_argument("--output-dir", default="test_results", help="Directory for the result files")
+    args = parser.parse_args()
+
+    run_static_checks(args.url, args.output_dir, render=args.render)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logging.info("Execution interrupted by user.")
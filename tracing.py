@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Recorded spans as Chrome trace "complete" events, and per-test, per-phase [count, total, max] seconds
+TRACE_EVENTS = []
+TIMING_STATS = {}
+TRACE_LOCK = threading.Lock()
+
+# Trace file the events are streamed to, once stream_trace was called; long runs then keep only a small buffer
+TRACE_STREAM = {"file": None, "path": None, "written": 0}
+TRACE_FLUSH_EVENTS = 1000
+
+# Name of the test the current code runs for, used to group spans in the timing table
+CURRENT_TEST = contextvars.ContextVar("current_test", default="Suite")
+
+# Run a block of code on behalf of a test
+@contextmanager
+def test_scope(test_name):
+    token = CURRENT_TEST.set(test_name)
+    try:
+        yield
+    finally:
+        CURRENT_TEST.reset(token)
+
+# Record how long a block of code takes
+@contextmanager
+def span(name, category="suite", **args):
+    """
+    Record a span for the Chrome trace and the timing table.
+
+    Args:
+        name (str): Phase name, e.g. "driver.get" or "link probe".
+        category (str): Trace category used to group related phases.
+        **args: Extra details shown in the trace viewer, e.g. the URL.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, category, start, time.perf_counter(), **args)
+
+# Record a span that was timed by the caller, for phases whose name depends on the outcome
+def record_span(name, category, start, end, **args):
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": dict(args, test=CURRENT_TEST.get()),
+    }
+    seconds = end - start
+    with TRACE_LOCK:
+        stats = TIMING_STATS.setdefault((event["args"]["test"], name), [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        TRACE_EVENTS.append(event)
+        if TRACE_STREAM["file"] and len(TRACE_EVENTS) >= TRACE_FLUSH_EVENTS:
+            _flush_events()
+
+# Append the buffered events to the trace file; call with TRACE_LOCK held
+def _flush_events():
+    f = TRACE_STREAM["file"]
+    for event in TRACE_EVENTS:
+        f.write(("," if TRACE_STREAM["written"] else "") + "\n" + json.dumps(event))
+        TRACE_STREAM["written"] += 1
+    f.flush()
+    TRACE_EVENTS.clear()
+
+# Stream the spans recorded from now on to a trace file instead of keeping them all in memory
+def stream_trace(filepath):
+    with TRACE_LOCK:
+        TRACE_STREAM.update(file=open(filepath, "w", encoding="utf-8"), path=filepath, written=0)
+        TRACE_STREAM["file"].write('{"displayTimeUnit": "ms", "traceEvents": [')
+        _flush_events()
+
+# Forget every recorded span
+def reset_trace():
+    with TRACE_LOCK:
+        TRACE_EVENTS.clear()
+        TIMING_STATS.clear()
+
+# Write the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto); completes a streamed trace
+def export_chrome_trace(filepath):
+    with TRACE_LOCK:
+        if TRACE_STREAM["file"] and TRACE_STREAM["path"] == filepath:
+            _flush_events()
+            TRACE_STREAM["file"].write("\n]}")
+            TRACE_STREAM["file"].close()
+            TRACE_STREAM.update(file=None, path=None, written=0)
+            return
+        events = list(TRACE_EVENTS)
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+# Per-test, per-phase timing table of the recorded spans
+def timing_table():
+    with TRACE_LOCK:
+        stats = [(test, phase, *values) for (test, phase), values in TIMING_STATS.items()]
+    table = pd.DataFrame(stats, columns=["Test", "Phase", "Count", "Total Seconds", "Max Seconds"])
+    return table.round({"Total Seconds": 3, "Max Seconds": 3})